@@ -1,5 +1,7 @@
 import os
 from groq import Groq
+from llm_gateway import PRIORITY_CHAT, chat_completion
+from conversation_memory import ConversationMemory
 
 # Set the API key
 os.environ['GROQ_API_KEY'] = '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'
@@ -16,6 +18,7 @@ class FinSaathiAI:
 
         # Initialize Groq client with the API key
         self.client = Groq(api_key=self.api_key)
+        self.memory = ConversationMemory(max_sessions=1)
         print("Welcome to FinSaathi AI! Your personalized financial assistant.")
         print("I’m here to answer your finance questions and provide actionable insights.")
         print("Type 'quit' or 'exit' anytime to end the conversation.\n")
@@ -36,14 +39,16 @@ class FinSaathiAI:
 
             # Generate response from LLaMA 90B model
             try:
-                response = self.client.chat.completions.create(
+                ai_response = chat_completion(
+                    self.client,
                     model="llama-3.2-90b-text-preview",
-                    messages=[{"role": "user", "content": user_input}],
+                    messages=self.memory.build_messages("cli", None, user_input),
+                    priority=PRIORITY_CHAT,
                     temperature=0.7
                 )
 
-                # Extract and print the AI response
-                ai_response = response.choices[0].message.content.strip()
+                # Remember the exchange and print the AI response
+                self.memory.record_turn("cli", user_input, ai_response)
                 print(f"FinSaathi AI: {ai_response}\n")
 
             except Exception as e:
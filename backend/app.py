@@ -1,12 +1,16 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from scheme_matcher import ImprovedSchemeMatcher
 from financial_report import PersonalFinanceAssistant
+from conversation_memory import ConversationMemory
+from llm_gateway import (
+    LLMUnavailableError, PRIORITY_CHAT, PRIORITY_REPORT, chat_completion, coalescer, scheduler
+)
 from werkzeug.middleware.proxy_fix import ProxyFix
-from groq import Groq
 from datetime import datetime
 from dotenv import load_dotenv
 import os
+import json
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -30,63 +34,141 @@ CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
 # Use ProxyFix for proper handling of proxy headers
 # app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+CHAT_SYSTEM_PROMPT = """You are FinSaathi AI, an expert financial advisor specialized in Indian financial markets 
+                        and investment options. Provide practical advice considering Indian context, available investment 
+                        options, and typical returns in the Indian market. Use INR amounts and Indian financial terms."""
+
 class FinSaathiAI:
     def __init__(self):
         self.api_key = os.environ.get('GROQ_API_KEY')
         if not self.api_key:
             raise ValueError("Groq API key must be provided in the GROQ_API_KEY environment variable.")
+
+        from groq import Groq
         self.client = Groq(api_key=self.api_key)
+        self.memory = ConversationMemory(summarizer=self.summarize_turns)
+
+    def summarize_turns(self, previous_summary, turns):
+        transcript = "\n".join(f"{turn['role'].capitalize()}: {turn['content']}" for turn in turns)
+        return chat_completion(
+            self.client,
+            model="llama3-70b-8192",
+            messages=[
+                {
+                    "role": "system",
+                    "content": """Update the running summary of a conversation between a user and FinSaathi AI.
+                    Keep facts about the user's finances, goals and questions that later answers depend on.
+                    Reply with the updated summary only, in under 150 words."""
+                },
+                {
+                    "role": "user",
+                    "content": f"Current summary:\n{previous_summary or '(none)'}\n\nNew turns:\n{transcript}"
+                }
+            ],
+            # Runs in the background, so it yields to chat and may wait for capacity
+            priority=PRIORITY_REPORT,
+            timeout=120.0,
+            temperature=0.2,
+            max_tokens=self.memory.summary_token_budget
+        )
     
-    def get_response(self, user_input):
+    def get_response(self, user_input, session_id=None):
+        if session_id:
+            messages = self.memory.build_messages(session_id, CHAT_SYSTEM_PROMPT, user_input)
+        else:
+            messages = [
+                {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+                {"role": "user", "content": user_input}
+            ]
+
         try:
-            response = self.client.chat.completions.create(
+            ai_response = chat_completion(
+                self.client,
                 model="llama3-70b-8192",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are FinSaathi AI, an expert financial advisor specialized in Indian financial markets 
-                        and investment options. Provide practical advice considering Indian context, available investment 
-                        options, and typical returns in the Indian market. Use INR amounts and Indian financial terms."""
-                    },
-                    {
-                        "role": "user",
-                        "content": user_input
-                    }
-                ],
+                messages=messages,
+                priority=PRIORITY_CHAT,
+                timeout=15.0,
                 temperature=0.7,
                 max_tokens=1000
             )
-            return response.choices[0].message.content.strip()
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"Error getting AI response: {str(e)}")
 
-# Initialize components
-try:
-    ai_assistant = FinSaathiAI()
+        if session_id:
+            self.memory.record_turn(session_id, user_input, ai_response)
+        return ai_response
+
+class LazyComponent:
+    """Create a component on first use; a failed initialization is remembered, as at startup before."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._value = None
+
+    def get(self):
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    try:
+                        self._value = self._factory()
+                    except Exception as e:
+                        print(f"Initialization error: {str(e)}")
+                        self._value = None
+                    self._initialized = True
+        return self._value
+
+    def peek(self):
+        """The component if it has already been created, without creating it."""
+        return self._value
+
+def load_matcher():
+    # Imported here so the chat and report endpoints never load the matching stack
+    from scheme_matcher import ImprovedSchemeMatcher
+
+    pdf_path = "./Government_Schemes-English.pdf"
+    catalog_dir = os.environ.get('SCHEME_CATALOG', './scheme_catalog')
+    if os.path.isdir(catalog_dir):
+        try:
+            return ImprovedSchemeMatcher.from_catalog(catalog_dir, pdf_path if os.path.exists(pdf_path) else None)
+        except ValueError as e:
+            print(f"Ignoring scheme catalog: {str(e)}")
     matcher = ImprovedSchemeMatcher()
-    matcher.load_schemes("./Government_Schemes-English.pdf")
-except Exception as e:
-    print(f"Initialization error: {str(e)}")
-    ai_assistant = None
-    matcher = None
+    matcher.load_schemes(pdf_path)
+    return matcher
 
-def create_error_response(message, status_code=400):
+# Initialize components on first use
+ai_assistant = LazyComponent(FinSaathiAI)
+matcher = LazyComponent(load_matcher)
+
+def create_error_response(message, status_code=400, headers=None):
     return jsonify({
         "status": "error",
         "message": message
-    }), status_code
+    }), status_code, headers or {}
+
+def create_llm_unavailable_response(error):
+    return create_error_response(str(error), error.status_code,
+                                 {"Retry-After": str(error.retry_after_seconds)})
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({
         "status": "healthy",
         "message": "Server is running",
-        "schemes_loaded": len(matcher.schemes) if matcher and hasattr(matcher, 'schemes') else 0
+        "schemes_loaded": len(matcher.peek().schemes) if matcher.peek() else 0,
+        "llm_coalescing": coalescer.stats(),
+        "llm_scheduler": scheduler.stats(),
+        "chat_sessions": ai_assistant.peek().memory.stats() if ai_assistant.peek() else {}
     })
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
-    if ai_assistant is None:
+    assistant = ai_assistant.get()
+    if assistant is None:
         return create_error_response("FinSaathi AI is not properly initialized", 500)
 
     try:
@@ -94,11 +176,16 @@ def chat():
         if not data or 'message' not in data:
             return create_error_response("No message provided")
 
-        ai_response = ai_assistant.get_response(data['message'])
+        # Only continue sessions this server issued; anything else starts a new one
+        session_id = str(data.get('session_id') or '')
+        if session_id not in assistant.memory:
+            session_id = assistant.memory.create_session()
+        ai_response = assistant.get_response(data['message'], session_id)
         current_time = datetime.now().strftime("%I:%M %p")
         
         return jsonify({
             "status": "success",
+            "session_id": session_id,
             "response": {
                 "type": "text",
                 "content": ai_response,
@@ -106,12 +193,15 @@ def chat():
                 "status": True
             }
         })
+    except LLMUnavailableError as e:
+        return create_llm_unavailable_response(e)
     except Exception as e:
         return create_error_response(str(e), 500)
 
 @app.route('/api/match-schemes', methods=['POST'])
 def match_schemes():
-    if matcher is None:
+    scheme_matcher = matcher.get()
+    if scheme_matcher is None:
         return create_error_response("Scheme matcher is not properly initialized", 500)
 
     try:
@@ -136,7 +226,8 @@ def match_schemes():
             "location": str(data["location"]).lower()
         }
         
-        matches = matcher.find_matching_schemes(profile, top_k=5)
+        keyword_scorer = str(data.get("keyword_scorer", "binary")).lower()
+        matches = scheme_matcher.find_matching_schemes(profile, top_k=5, keyword_scorer=keyword_scorer)
         
         formatted_matches = [{
             "scheme_code": match["scheme_code"],
@@ -179,11 +270,36 @@ def generate_financial_report():
             "status": "success",
             "report": report
         })
+    except LLMUnavailableError as e:
+        return create_llm_unavailable_response(e)
     except ValueError as ve:
         return create_error_response(f"Invalid data format: {str(ve)}")
     except Exception as e:
         return create_error_response(str(e), 500)
 
+@app.route('/api/generate-report/stream', methods=['POST'])
+def stream_financial_report():
+    try:
+        data = request.get_json()
+        if not data:
+            return create_error_response("No data provided")
+
+        assistant = PersonalFinanceAssistant()
+        income = float(data['income'])
+        expenses = data['expenses']
+        savings = float(data['savings'])
+        goals = assistant.parse_goals(data['goals'])
+    except ValueError as ve:
+        return create_error_response(f"Invalid data format: {str(ve)}")
+    except Exception as e:
+        return create_error_response(str(e), 500)
+
+    def generate():
+        for event in assistant.iter_report_sections(income, expenses, savings, goals):
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.errorhandler(404)
 def not_found(error):
     return create_error_response("Resource not found", 404)
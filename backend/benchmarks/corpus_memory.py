@@ -0,0 +1,149 @@
+"""
+Memory and scoring benchmark for the columnar scheme corpus.
+
+Builds synthetic corpora of increasing size both as the previous list of
+per-scheme dataclass objects and as a SchemeCorpus, and reports retained
+memory per scheme and the time to score one profile against every scheme.
+No encoder is needed; embeddings are random.
+
+    python benchmarks/corpus_memory.py --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scheme_matcher import EMBEDDING_DIM, ImprovedSchemeMatcher, SchemeCorpus
+
+MINISTRIES = [f"{chr(65 + i % 26)}. MINISTRY OF DEPARTMENT NUMBER {i}" for i in range(40)]
+WORDS = ("women farmer student rural urban pension scheduled caste tribal youth loan subsidy "
+         "training employment housing health education vendor artisan minority widow").split()
+
+PROFILE = {
+    "gender": "female",
+    "age": "16",
+    "occupation": "farmer",
+    "income": "100000",
+    "category": "sc",
+    "location": "rural"
+}
+
+
+@dataclass
+class LegacyScheme:
+    """The previous per-object representation"""
+    code: str
+    name: str
+    ministry: str
+    objective: str
+    beneficiary: str
+    features: str
+    embedding: Optional[np.ndarray] = None
+
+
+def synthetic_records(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Fresh strings and embedding per scheme, as if parsed from a document."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        words = rng.choice(WORDS, size=60)
+        yield {
+            'code': f"{chr(65 + i % 26)}.{i}.",
+            'name': f"Scheme number {i}",
+            'ministry': ''.join(MINISTRIES[i % len(MINISTRIES)]),
+            'objective': ' '.join(words[:20]),
+            'beneficiary': ' '.join(words[20:40]),
+            'features': ' '.join(words[40:]),
+            'embedding': rng.standard_normal(EMBEDDING_DIM).astype(np.float32)
+        }
+
+
+def build_legacy(count: int) -> List[LegacyScheme]:
+    return [LegacyScheme(**record) for record in synthetic_records(count)]
+
+
+def build_corpus(count: int) -> SchemeCorpus:
+    corpus = SchemeCorpus()
+    for record in synthetic_records(count):
+        corpus.append(**record)
+    corpus.compact()
+    return corpus
+
+
+def retained_bytes(build, count: int):
+    tracemalloc.start()
+    result = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def legacy_find_matching_schemes(matcher: ImprovedSchemeMatcher, schemes: List[LegacyScheme],
+                                 profile: Dict, top_k: int = 5) -> List[Dict]:
+    """The previous per-object scoring loop."""
+    profile_embedding = matcher._get_embedding(matcher.profile_text(profile))
+    matches = []
+    for scheme in schemes:
+        scheme_text = f"{scheme.beneficiary} {scheme.features} {scheme.objective}".lower()
+        score, total_weight, reasons = 0.0, 0.0, []
+        for criterion, weight in matcher.criterion_weights.items():
+            if criterion not in profile:
+                continue
+            total_weight += weight
+            keywords = matcher.keyword_mappings.get(criterion, {}).get(str(profile[criterion]).lower(), [])
+            matched = [k for k in keywords if k in scheme_text]
+            if matched:
+                reasons.append(f"Matches {profile[criterion]} {criterion} (keywords: {', '.join(matched)})")
+                score += weight
+        keyword_score = score / total_weight if total_weight else 0.0
+        semantic_score = matcher._cosine_similarity(profile_embedding, scheme.embedding)
+        final_score = keyword_score * 0.6 + semantic_score * 0.4
+        if final_score > 0.2:
+            matches.append({'scheme_code': scheme.code, 'match_score': round(final_score * 100, 2),
+                            'relevance_reasons': reasons})
+    return sorted(matches, key=lambda x: x['match_score'], reverse=True)[:top_k]
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help="Corpus sizes")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed scoring runs; the best is reported")
+    args = parser.parse_args()
+
+    print(f"{'schemes':>8} {'legacy B/scheme':>16} {'columnar B/scheme':>18} "
+          f"{'legacy score ms':>16} {'columnar score ms':>18}")
+    for size in args.sizes:
+        legacy, legacy_bytes = retained_bytes(build_legacy, size)
+        corpus, corpus_bytes = retained_bytes(build_corpus, size)
+
+        matcher = ImprovedSchemeMatcher()
+        matcher.schemes = corpus
+        profile_text = matcher.profile_text(PROFILE)
+        matcher.profile_embeddings = {profile_text: np.random.default_rng(1).standard_normal(EMBEDDING_DIM)}
+
+        # Warm the keyword masks, as a long-running server would have
+        matcher.find_matching_schemes(PROFILE)
+        legacy_time = best_time(lambda: legacy_find_matching_schemes(matcher, legacy, PROFILE), args.repeat)
+        corpus_time = best_time(lambda: matcher.find_matching_schemes(PROFILE), args.repeat)
+
+        print(f"{size:>8} {legacy_bytes / size:>16.0f} {corpus_bytes / size:>18.0f} "
+              f"{legacy_time * 1000:>16.2f} {corpus_time * 1000:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Import-time profile of the backend entry points.
+
+Imports each module in a fresh interpreter under `python -X importtime` and
+reports the total import time, the slowest imports by cumulative time and
+the self time spent in each top-level package. Exits non-zero when a module
+goes over --budget-ms or imports one of the --forbid packages, so startup
+regressions can be caught before they ship.
+
+    python benchmarks/import_profile.py app financial_report --budget-ms 1500
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+DEFAULT_MODULES = ['app', 'financial_report', 'scheme_matcher', 'scheme_catalog']
+
+# Packages the serving entry points should only load on first use
+DEFAULT_FORBIDDEN = ['torch', 'sentence_transformers', 'transformers', 'sklearn', 'pandas', 'pypdf']
+
+
+def profile_import(module: str, python: str = sys.executable) -> List[Dict]:
+    """
+    Import a module in a fresh interpreter and parse its -X importtime output.
+
+    Returns one entry per imported module, in import order, with self and
+    cumulative time in microseconds.
+
+    Args:
+        module (str): Module to import, relative to the backend directory
+        python (str): Interpreter to profile with
+    """
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us)
+        })
+    return entries
+
+
+def summarize(entries: List[Dict], top: int) -> Dict:
+    by_package: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        by_package[entry['module'].split('.')[0]] += entry['self_us']
+
+    return {
+        'total_us': sum(entry['self_us'] for entry in entries),
+        'slowest': sorted(entries, key=lambda e: e['cumulative_us'], reverse=True)[:top],
+        'packages': sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top],
+        'loaded': {entry['module'].split('.')[0] for entry in entries}
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="Modules to profile")
+    parser.add_argument('--top', type=int, default=10, help="Rows shown per table")
+    parser.add_argument('--budget-ms', type=float, help="Fail when a module takes longer than this to import")
+    parser.add_argument('--forbid', nargs='*', default=DEFAULT_FORBIDDEN,
+                        help="Fail when a module imports any of these packages (pass no values to disable)")
+    parser.add_argument('--python', default=sys.executable, help="Interpreter to profile with")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module in args.modules:
+        try:
+            summary = summarize(profile_import(module, args.python), args.top)
+        except RuntimeError as e:
+            print(str(e))
+            failures.append(module)
+            continue
+
+        total_ms = summary['total_us'] / 1000
+        print(f"\n{module}: {total_ms:.1f} ms")
+        print(f"  {'cumulative ms':>13} {'self ms':>8}  slowest imports")
+        for entry in summary['slowest']:
+            print(f"  {entry['cumulative_us'] / 1000:>13.1f} {entry['self_us'] / 1000:>8.1f}  "
+                  f"{'  ' * entry['depth']}{entry['module']}")
+        print(f"  {'self ms':>13}  by package")
+        for package, self_us in summary['packages']:
+            print(f"  {self_us / 1000:>13.1f}  {package}")
+
+        forbidden = sorted(summary['loaded'].intersection(args.forbid))
+        if forbidden:
+            print(f"  FAIL: imports {', '.join(forbidden)}")
+            failures.append(module)
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            print(f"  FAIL: over the {args.budget_ms:.0f} ms budget")
+            failures.append(module)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Parse-throughput benchmark for ImprovedSchemeMatcher.extract_scheme_details.
+
+Splits the scheme PDF into per-scheme blocks the same way load_schemes does,
+checks that the parser output matches the previous implementation (kept
+below as the reference) and reports schemes and megabytes parsed per second
+for both.
+
+    python benchmarks/parse_throughput.py --pdf ./Government_Schemes-English.pdf
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scheme_matcher import ImprovedSchemeMatcher
+
+
+def legacy_clean_text(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text.strip())
+    text = re.sub(r'[^\w\s.,;()-]', '', text)
+    text = re.sub(r'(?i)rs\.?\s*', 'rs ', text)
+    text = re.sub(r'(\d+)\s*-\s*(\d+)', r'\1-\2', text)
+    return text.strip()
+
+
+def legacy_extract_scheme_details(text: str) -> Optional[Dict]:
+    if not text:
+        return None
+
+    scheme_header_match = re.match(r'([A-Z]\.\d+\.)\s*([^\n]+)', text)
+    if not scheme_header_match:
+        return None
+
+    scheme_code = scheme_header_match.group(1).strip()
+    scheme_name = scheme_header_match.group(2).strip()
+
+    if re.search(r'\d+$', scheme_name) and len(text.split('\n')) < 3:
+        return None
+
+    sections = {
+        'objective': ['objective', 'aim', 'purpose', 'goals'],
+        'beneficiary': ['intended beneficiary', 'beneficiaries', 'eligible', 'eligibility', 'target group'],
+        'features': ['salient features', 'key features', 'benefits', 'assistance provided']
+    }
+    extracted_sections = {'objective': '', 'beneficiary': '', 'features': ''}
+
+    current_section = None
+    for line in text.split('\n'):
+        line = line.strip().lower()
+        for section, headers in sections.items():
+            if any(header.lower() in line for header in headers):
+                current_section = section
+                continue
+        if current_section and line and not any(header.lower() in line for headers in sections.values() for header in headers):
+            extracted_sections[current_section] += line + ' '
+
+    for section in extracted_sections:
+        extracted_sections[section] = legacy_clean_text(extracted_sections[section])
+
+    return {
+        'code': scheme_code,
+        'name': scheme_name,
+        'objective': extracted_sections['objective'],
+        'beneficiary': extracted_sections['beneficiary'],
+        'features': extracted_sections['features']
+    }
+
+
+def scheme_blocks(pdf_path: str) -> List[str]:
+    """Per-scheme text blocks, split as in ImprovedSchemeMatcher.load_schemes."""
+    import pypdf
+
+    blocks = []
+    current = None
+    for page in pypdf.PdfReader(pdf_path).pages:
+        for line in page.extract_text().split('\n'):
+            if re.match(r'([A-Z]\.)\s+MINISTRY.*', line):
+                continue
+            if re.match(r'[A-Z]\.\d+\.', line):
+                if current:
+                    blocks.append(current)
+                current = line
+            elif current is not None:
+                current += "\n" + line
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def measure(parse: Callable[[str], Optional[Dict]], blocks: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for block in blocks:
+            parse(block)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pdf', default='./Government_Schemes-English.pdf', help="Scheme PDF to parse")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed passes; the best is reported")
+    args = parser.parse_args()
+
+    matcher = ImprovedSchemeMatcher()
+    blocks = scheme_blocks(args.pdf)
+
+    mismatches = [
+        block.split('\n', 1)[0] for block in blocks
+        if matcher.extract_scheme_details(block) != legacy_extract_scheme_details(block)
+    ]
+    if mismatches:
+        print(f"Output differs from the reference parser for {len(mismatches)} blocks:")
+        for header in mismatches[:10]:
+            print(f"  {header}")
+        sys.exit(1)
+
+    megabytes = sum(len(block.encode('utf-8')) for block in blocks) / 1e6
+    print(f"{len(blocks)} scheme blocks, {megabytes:.2f} MB, output identical to reference parser")
+
+    timings = {
+        'reference': measure(legacy_extract_scheme_details, blocks, args.repeat),
+        'current': measure(matcher.extract_scheme_details, blocks, args.repeat)
+    }
+    for name, seconds in timings.items():
+        print(f"{name:>10}: {seconds * 1000:8.2f} ms  "
+              f"{len(blocks) / seconds:10.0f} schemes/s  {megabytes / seconds:8.2f} MB/s")
+    print(f"   speedup: {timings['reference'] / timings['current']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Regression checks for the LLM scheduler's admission behaviour.
+
+Runs the scheduler against stub calls (no network) and asserts that queued
+calls sleep instead of spinning, that a drained bucket admits queued calls
+at its refill rate, that concurrency slots go to chat ahead of reports and
+that a full queue makes room for chat by evicting a report.
+
+    python benchmarks/scheduler_check.py
+"""
+import os
+import sys
+import threading
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from llm_gateway import PRIORITY_CHAT, PRIORITY_REPORT, LLMOverloadedError, LLMScheduler
+
+UNLIMITED = {'rpm': 100000, 'tpm': 10 ** 9}
+
+
+def start(fn: Callable[[], None]) -> threading.Thread:
+    thread = threading.Thread(target=fn)
+    thread.start()
+    return thread
+
+
+def check_queued_call_sleeps() -> None:
+    """A call waiting for a busy slot must not spin while it waits."""
+    scheduler = LLMScheduler({'m': UNLIMITED}, max_concurrency=1)
+    in_flight = start(lambda: scheduler.run('m', lambda: time.sleep(2.0), 10))
+    time.sleep(0.1)
+
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    scheduler.run('m', lambda: None, 10)
+    cpu, wall = time.process_time() - cpu_start, time.monotonic() - wall_start
+    in_flight.join()
+
+    assert wall > 1.5, f"queued call did not wait for the slot ({wall:.2f} s)"
+    assert cpu < 0.2, f"queued call used {cpu:.2f} s of CPU in {wall:.2f} s of waiting"
+    print(f"queued call slept: {cpu:.3f} s CPU over {wall:.2f} s")
+
+
+def check_bucket_refill_admissions() -> None:
+    """With a drained bucket, queued calls are admitted at the refill rate, not after upstream calls finish."""
+    scheduler = LLMScheduler({'m': {'rpm': 60, 'tpm': 10 ** 9}}, max_concurrency=4)
+    scheduler._limiter('m').requests.consume(60, time.monotonic())
+    started = time.monotonic()
+    admitted: List[float] = []
+
+    def call():
+        scheduler.run('m', lambda: (admitted.append(time.monotonic() - started), time.sleep(3.0)), 10)
+
+    threads = [start(call) for _ in range(3)]
+    for thread in threads:
+        thread.join()
+
+    assert max(admitted) < 3.5, f"admissions at {[round(a, 1) for a in admitted]} s"
+    print(f"drained bucket admissions: {[round(a, 1) for a in sorted(admitted)]} s")
+
+
+def check_chat_gets_slot_first() -> None:
+    """A freed slot goes to a waiting chat call ahead of an earlier report for another model."""
+    scheduler = LLMScheduler({'chat': UNLIMITED, 'report': UNLIMITED}, max_concurrency=1)
+    order: List[str] = []
+    gate = threading.Event()
+
+    blocker = start(lambda: scheduler.run('report', gate.wait, 10))
+    time.sleep(0.1)
+    report = start(lambda: scheduler.run('report', lambda: order.append('report'), 10, priority=PRIORITY_REPORT))
+    time.sleep(0.1)
+    chat = start(lambda: scheduler.run('chat', lambda: order.append('chat'), 10, priority=PRIORITY_CHAT))
+    time.sleep(0.1)
+    gate.set()
+    for thread in (blocker, report, chat):
+        thread.join()
+
+    assert order == ['chat', 'report'], f"slot order was {order}"
+    print(f"slot order: {order}")
+
+
+def check_full_queue_admits_chat() -> None:
+    """A chat call arriving at a queue full of reports evicts a report instead of being shed."""
+    scheduler = LLMScheduler({'m': UNLIMITED}, max_queue=2, max_concurrency=1)
+    gate = threading.Event()
+    outcomes: List[str] = []
+
+    def call(name: str, priority: int) -> None:
+        try:
+            scheduler.run('m', lambda: outcomes.append(name), 10, priority=priority)
+        except LLMOverloadedError:
+            outcomes.append(f"{name} shed")
+
+    blocker = start(lambda: scheduler.run('m', gate.wait, 10))
+    time.sleep(0.1)
+    reports = [start(lambda i=i: call(f"report {i}", PRIORITY_REPORT)) for i in range(2)]
+    time.sleep(0.1)
+    chat = start(lambda: call('chat', PRIORITY_CHAT))
+    time.sleep(0.1)
+    gate.set()
+    for thread in [blocker, chat] + reports:
+        thread.join()
+
+    assert 'chat' in outcomes, f"chat was not served: {outcomes}"
+    assert 'report 1 shed' in outcomes, f"the latest report was not evicted: {outcomes}"
+    assert scheduler.stats()['evicted_from_queue'] == 1
+    print(f"full queue outcomes: {outcomes}")
+
+
+def main() -> int:
+    checks = [check_queued_call_sleeps, check_bucket_refill_admissions,
+              check_chat_gets_slot_first, check_full_queue_admits_chat]
+    failures = 0
+    for check in checks:
+        try:
+            check()
+        except AssertionError as e:
+            failures += 1
+            print(f"FAIL {check.__name__}: {e}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
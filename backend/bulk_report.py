@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_report import PersonalFinanceAssistant
+from llm_gateway import LLMProviderRateLimitedError
+
+EXPENSE_PREFIX = 'expense_'
+
+# Monthly household income (INR) treated as a living wage
+DEFAULT_LIVING_WAGE = 15000
+
+# Same horizon generate_financial_report uses for savings plans
+GOAL_TIMEFRAME_MONTHS = 12
+
+# Seconds a narrative may wait for scheduler capacity; batch work can queue
+# behind interactive traffic instead of being shed
+DEFAULT_LLM_TIMEOUT = 900.0
+
+INCOME_BANDS = [0, 10000, 20000, 35000, 50000, np.inf]
+INCOME_BAND_LABELS = ['<10k', '10k-20k', '20k-35k', '35k-50k', '50k+']
+EXPENSE_RATIO_BANDS = [-np.inf, 50, 80, 100, np.inf]
+EXPENSE_RATIO_LABELS = ['<50%', '50-80%', '80-100%', '>100%']
+
+
+def load_households(csv_path: str) -> Tuple[pd.DataFrame, list]:
+    """
+    Read a household CSV.
+
+    Expected columns are income, savings, goals ("Description: amount" entries
+    separated by ";"), one expense_<category> column per expense category and
+    optionally a unique household_id (row numbers are used otherwise).
+
+    Args:
+        csv_path (str): Path to the CSV file
+    """
+    df = pd.read_csv(csv_path)
+    expense_columns = [column for column in df.columns if column.startswith(EXPENSE_PREFIX)]
+    missing = [column for column in ('income', 'savings') if column not in df.columns]
+    if missing or not expense_columns:
+        raise ValueError(f"CSV must have income, savings and {EXPENSE_PREFIX}* columns "
+                         f"(missing: {', '.join(missing) or EXPENSE_PREFIX + '*'})")
+
+    if 'household_id' not in df.columns:
+        df['household_id'] = df.index
+    df['household_id'] = df['household_id'].astype(str)
+    duplicated = df['household_id'][df['household_id'].duplicated()].unique()
+    if len(duplicated):
+        raise ValueError(f"household_id must be unique; repeated: {', '.join(duplicated[:5])}"
+                         f"{' ...' if len(duplicated) > 5 else ''}")
+    if 'goals' not in df.columns:
+        df['goals'] = ''
+
+    numeric_columns = ['income', 'savings'] + expense_columns
+    df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0.0)
+    df['goals'] = df['goals'].fillna('').astype(str)
+    return df, expense_columns
+
+
+def compute_household_metrics(df: pd.DataFrame, expense_columns: list,
+                              living_wage: float = DEFAULT_LIVING_WAGE) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute the deterministic parts of the report for every household at once.
+
+    Returns one row per household (totals, expense ratio, living-wage status,
+    surplus, dominant expense) and one row per goal (monthly target and
+    feasibility against the household's surplus).
+
+    Args:
+        df (pd.DataFrame): Households from load_households
+        expense_columns (list): Expense columns in df
+        living_wage (float): Monthly income treated as a living wage
+    """
+    expenses = df[expense_columns].to_numpy(dtype=np.float64)
+    income = df['income'].to_numpy(dtype=np.float64)
+    total_expenses = expenses.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expense_ratio = np.where(income > 0, total_expenses / income * 100, np.inf)
+
+    metrics = pd.DataFrame({
+        'household_id': df['household_id'].to_numpy(),
+        'income': income,
+        'savings': df['savings'].to_numpy(dtype=np.float64),
+        'total_expenses': total_expenses,
+        'expense_ratio': np.round(expense_ratio, 2),
+        'monthly_surplus': income - total_expenses,
+        'income_status': np.where(income >= living_wage, 'living wage', 'below living wage'),
+        'dominant_expense': np.asarray(expense_columns)[expenses.argmax(axis=1)]
+    })
+    metrics['dominant_expense'] = metrics['dominant_expense'].str[len(EXPENSE_PREFIX):]
+
+    goals = df[['household_id', 'goals']].assign(goal=df['goals'].str.split(';')).explode('goal')
+    parts = goals['goal'].str.split(':', n=1, expand=True).reindex(columns=[0, 1])
+    goals = pd.DataFrame({
+        'household_id': goals['household_id'].to_numpy(),
+        'goal': parts[0].str.strip().to_numpy(),
+        'target_amount': pd.to_numeric(parts[1], errors='coerce').to_numpy()
+    }).dropna(subset=['target_amount'])
+
+    surplus = goals['household_id'].map(metrics.set_index('household_id')['monthly_surplus'])
+    goals['monthly_target'] = np.round(goals['target_amount'] / GOAL_TIMEFRAME_MONTHS, 2)
+    goals['feasibility_assessment'] = np.select(
+        [goals['monthly_target'] <= 0.5 * surplus, goals['monthly_target'] <= surplus],
+        ['realistic', 'challenging'],
+        default='unrealistic'
+    )
+    return metrics, goals
+
+
+def assign_archetypes(metrics: pd.DataFrame) -> pd.Series:
+    """Group households by income band, expense ratio band and dominant expense."""
+    income_band = pd.cut(metrics['income'], INCOME_BANDS, labels=INCOME_BAND_LABELS, right=False)
+    ratio_band = pd.cut(metrics['expense_ratio'], EXPENSE_RATIO_BANDS, labels=EXPENSE_RATIO_LABELS)
+    return (income_band.astype(str) + '|' + ratio_band.astype(str) + '|' + metrics['dominant_expense'])
+
+
+def _read_progress(output_path: str) -> Tuple[Set[str], Dict[str, Any]]:
+    """
+    Households already written and archetype narratives already generated.
+
+    A partially written last line from an interrupted run is cut off so
+    appending continues on a clean line.
+    """
+    done: Set[str] = set()
+    narratives: Dict[str, Any] = {}
+    if not os.path.exists(output_path):
+        return done, narratives
+
+    with open(output_path, 'rb+') as f:
+        content = f.read()
+        end = content.rfind(b'\n') + 1
+        if end < len(content):
+            f.truncate(end)
+
+    for line in content[:end].decode('utf-8').splitlines():
+        record = json.loads(line)
+        if record.get('type') == 'archetype':
+            narratives[record['archetype']] = record['financial_analysis']
+        elif record.get('type') == 'household':
+            done.add(record['household_id'])
+    return done, narratives
+
+
+def _representative_expenses(members: pd.DataFrame, expense_columns: list) -> Tuple[float, Dict[str, float]]:
+    medians = members[['income'] + expense_columns].median()
+    expenses = {
+        column[len(EXPENSE_PREFIX):].replace('_', ' ').title(): round(float(medians[column]), 2)
+        for column in expense_columns
+    }
+    return round(float(medians['income']), 2), expenses
+
+
+def _narrate(assistant: PersonalFinanceAssistant, income: float, expenses: Dict[str, float],
+             timeout: float, max_attempts: int = 3) -> Optional[Dict[str, Any]]:
+    """
+    Expense analysis for one archetype.
+
+    The call waits up to timeout for scheduler capacity; being shed by the
+    scheduler is final. Only provider rate limit errors are retried, after a
+    jittered delay so parallel workers do not all wake at once and collide
+    again.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return assistant.analyze_expenses(income, expenses, timeout=timeout)
+        except LLMProviderRateLimitedError as e:
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(e.retry_after * random.uniform(1.0, 2.0))
+
+
+def run_bulk_report(csv_path: str, output_path: str, concurrency: int = 4,
+                    living_wage: float = DEFAULT_LIVING_WAGE,
+                    llm_timeout: float = DEFAULT_LLM_TIMEOUT) -> Dict[str, int]:
+    """
+    Generate reports for every household in a CSV and append them to an NDJSON file.
+
+    Deterministic figures are computed for the whole table up front. An LLM
+    narrative is requested once per household archetype, and each archetype's
+    households are written as soon as its narrative arrives. Households and
+    narratives already present in output_path are skipped, so an interrupted
+    run can be restarted with the same arguments.
+
+    Args:
+        csv_path (str): Household CSV (see load_households)
+        output_path (str): NDJSON file to append results to
+        concurrency (int): Archetype narratives requested in parallel
+        living_wage (float): Monthly income treated as a living wage
+        llm_timeout (float): Seconds each narrative may wait for LLM capacity
+    """
+    df, expense_columns = load_households(csv_path)
+    metrics, goals = compute_household_metrics(df, expense_columns, living_wage)
+    metrics['archetype'] = assign_archetypes(metrics)
+    df['archetype'] = metrics['archetype'].to_numpy()
+
+    done, narratives = _read_progress(output_path)
+    pending = metrics[~metrics['household_id'].isin(done)]
+    goals_by_household = {
+        household_id: group.drop(columns='household_id').to_dict('records')
+        for household_id, group in goals[goals['household_id'].isin(pending['household_id'])].groupby('household_id')
+    }
+    analysis_date = datetime.now().strftime('%Y-%m-%d')
+    summary = {'households': len(metrics), 'skipped': len(metrics) - len(pending),
+               'archetypes': 0, 'llm_calls': 0, 'written': 0}
+
+    with open(output_path, 'a', encoding='utf-8') as out:
+        def write(record: Dict[str, Any]) -> None:
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+
+        pending_by_archetype = {archetype: group for archetype, group in pending.groupby('archetype')}
+
+        def write_households(archetype: str) -> None:
+            for row in pending_by_archetype[archetype].to_dict('records'):
+                row = {key: (None if isinstance(value, float) and not np.isfinite(value) else value)
+                       for key, value in row.items()}
+                write({
+                    'type': 'household',
+                    'analysis_date': analysis_date,
+                    **row,
+                    'goals': goals_by_household.get(row['household_id'], [])
+                })
+                summary['written'] += 1
+
+        archetypes = list(pending_by_archetype)
+        summary['archetypes'] = len(archetypes)
+
+        for archetype in [a for a in archetypes if a in narratives]:
+            write_households(archetype)
+
+        assistant = PersonalFinanceAssistant()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {}
+            for archetype in [a for a in archetypes if a not in narratives]:
+                income, expenses = _representative_expenses(df[df['archetype'] == archetype], expense_columns)
+                futures[executor.submit(_narrate, assistant, income, expenses, llm_timeout)] = archetype
+            summary['llm_calls'] = len(futures)
+
+            for future in as_completed(futures):
+                archetype = futures[future]
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    print(f"Error generating narrative for {archetype}: {str(e)}")
+                    continue
+                if analysis is None:
+                    # Leave the archetype's households unwritten so a rerun retries them
+                    print(f"No narrative generated for {archetype}")
+                    continue
+                write({'type': 'archetype', 'archetype': archetype, 'financial_analysis': analysis})
+                write_households(archetype)
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate financial reports for a CSV of households.")
+    parser.add_argument('csv_path', help="Household CSV with income, savings, goals and expense_* columns")
+    parser.add_argument('output_path', help="NDJSON file to write (resumed if it already exists)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Narratives requested in parallel")
+    parser.add_argument('--living-wage', type=float, default=DEFAULT_LIVING_WAGE,
+                        help="Monthly income treated as a living wage")
+    parser.add_argument('--llm-timeout', type=float, default=DEFAULT_LLM_TIMEOUT,
+                        help="Seconds each narrative may wait for LLM capacity")
+    args = parser.parse_args()
+
+    summary = run_bulk_report(args.csv_path, args.output_path, args.concurrency, args.living_wage,
+                              args.llm_timeout)
+    print(json.dumps(summary, indent=4))
+
+
+if __name__ == "__main__":
+    main()
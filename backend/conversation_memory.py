@@ -0,0 +1,209 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from llm_gateway import estimate_tokens
+
+Turn = Dict[str, str]
+Summarizer = Callable[[str, List[Turn]], str]
+
+
+def extractive_summary(previous_summary: str, turns: List[Turn], snippet_chars: int = 160) -> str:
+    """
+    Summarize turns without an LLM by keeping the start of each message.
+
+    Args:
+        previous_summary (str): Summary of turns rolled up earlier
+        turns (List[Turn]): Turns being rolled into the summary
+        snippet_chars (int): Characters kept from each message
+    """
+    lines = [previous_summary] if previous_summary else []
+    for turn in turns:
+        content = " ".join(turn['content'].split())
+        if len(content) > snippet_chars:
+            content = content[:snippet_chars].rstrip() + "..."
+        lines.append(f"{turn['role'].capitalize()}: {content}")
+    return "\n".join(lines)
+
+
+class _Session:
+    __slots__ = ('summary', 'summarized', 'pending', 'summarizing', 'turns', 'turn_tokens', 'last_used', 'lock')
+
+    def __init__(self):
+        self.summary = ""
+        # Summary produced by the summarizer, and overflow turns it has not folded in yet
+        self.summarized = ""
+        self.pending: List[Turn] = []
+        self.summarizing = False
+        self.turns: List[Turn] = []
+        self.turn_tokens = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+
+class ConversationMemory:
+    def __init__(self,
+                 recent_token_budget: int = 1500,
+                 summary_token_budget: int = 300,
+                 max_sessions: int = 1000,
+                 idle_timeout: float = 1800.0,
+                 summarizer: Optional[Summarizer] = None):
+        """
+        Per-session conversation state with a bounded prompt size.
+
+        Recent turns are kept verbatim up to recent_token_budget; older turns
+        are rolled into a summary capped at summary_token_budget. A custom
+        summarizer runs on a background thread, off the request path; until it
+        finishes, the overflow turns are folded in with extractive_summary.
+        Sessions are kept in LRU order and dropped once idle or when
+        max_sessions is exceeded.
+
+        Args:
+            recent_token_budget (int): Tokens of verbatim history sent with each message
+            summary_token_budget (int): Tokens allowed for the rolled-up summary
+            max_sessions (int): Maximum number of sessions held in memory
+            idle_timeout (float): Seconds after which an unused session is dropped
+            summarizer (Summarizer, optional): Function folding turns into the summary
+        """
+        self.recent_token_budget = recent_token_budget
+        self.summary_token_budget = summary_token_budget
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.summarizer = summarizer or extractive_summary
+
+        self._lock = threading.Lock()
+        self._sessions: 'OrderedDict[str, _Session]' = OrderedDict()
+        self._summary_executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session is not None and time.monotonic() - session.last_used < self.idle_timeout
+
+    def create_session(self) -> str:
+        """Start a session under a new unguessable identifier and return it."""
+        session_id = uuid.uuid4().hex
+        self._session(session_id)
+        return session_id
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - session.last_used < self.idle_timeout:
+                break
+            del self._sessions[session_id]
+
+    def _session(self, session_id: str) -> _Session:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = _Session()
+                self._sessions[session_id] = session
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_used = now
+            self._evict(now)
+            return session
+
+    def _truncate_summary(self, summary: str) -> str:
+        max_chars = self.summary_token_budget * 4
+        if len(summary) <= max_chars:
+            return summary
+        # Keep the most recent part of the summary
+        return "..." + summary[-(max_chars - 3):]
+
+    def build_messages(self, session_id: str, system_prompt: Optional[str], user_message: str) -> List[Turn]:
+        """
+        Build the prompt for user_message from the session's summary and recent turns.
+
+        Args:
+            session_id (str): Conversation identifier
+            system_prompt (str, optional): System instructions sent first
+            user_message (str): The new user message
+        """
+        session = self._session(session_id)
+        with session.lock:
+            messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+            if session.summary:
+                messages.append({
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation:\n{session.summary}"
+                })
+            messages.extend(dict(turn) for turn in session.turns)
+        messages.append({"role": "user", "content": user_message})
+        return messages
+
+    def record_turn(self, session_id: str, user_message: str, assistant_message: str) -> None:
+        """
+        Append a completed exchange and roll older turns into the summary.
+
+        Args:
+            session_id (str): Conversation identifier
+            user_message (str): Message the user sent
+            assistant_message (str): Reply that was returned
+        """
+        session = self._session(session_id)
+        with session.lock:
+            for turn in ({"role": "user", "content": user_message},
+                         {"role": "assistant", "content": assistant_message}):
+                session.turns.append(turn)
+                session.turn_tokens += estimate_tokens(turn['content'])
+
+            overflow = []
+            while session.turn_tokens > self.recent_token_budget and session.turns:
+                turn = session.turns.pop(0)
+                session.turn_tokens -= estimate_tokens(turn['content'])
+                overflow.append(turn)
+
+            if not overflow:
+                return
+            session.pending.extend(overflow)
+            session.summary = self._truncate_summary(extractive_summary(session.summarized, session.pending))
+            if self.summarizer is extractive_summary:
+                session.summarized, session.pending = session.summary, []
+            elif not session.summarizing:
+                session.summarizing = True
+                self._summaries().submit(self._summarize, session)
+
+    def _summaries(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._summary_executor is None:
+                self._summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='conversation-summary')
+            return self._summary_executor
+
+    def _summarize(self, session: _Session) -> None:
+        """Fold a session's pending turns into its summary with the summarizer."""
+        while True:
+            with session.lock:
+                if not session.pending:
+                    session.summarizing = False
+                    return
+                previous_summary, turns = session.summarized, list(session.pending)
+
+            try:
+                summary = self.summarizer(previous_summary, turns)
+            except Exception as e:
+                print(f"Error summarizing conversation: {str(e)}")
+                summary = extractive_summary(previous_summary, turns)
+
+            with session.lock:
+                session.summarized = self._truncate_summary(summary)
+                del session.pending[:len(turns)]
+                session.summary = self._truncate_summary(
+                    extractive_summary(session.summarized, session.pending)
+                ) if session.pending else session.summarized
+
+    def stats(self) -> Dict[str, int]:
+        """Number of live sessions and configured budgets."""
+        return {
+            'sessions': len(self._sessions),
+            'recent_token_budget': self.recent_token_budget,
+            'summary_token_budget': self.summary_token_budget
+        }
@@ -1,9 +1,10 @@
 import os
-from typing import Dict, Any, List, Optional
-from groq import Groq
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 from dotenv import load_dotenv
+from llm_gateway import LLMUnavailableError, chat_completion
 
 load_dotenv()
 
@@ -19,15 +20,18 @@ class PersonalFinanceAssistant:
         if not self.api_key:
             raise ValueError("Groq API key must be provided or set as GROQ_API_KEY environment variable")
 
+        from groq import Groq
         self.client = Groq(api_key=self.api_key)
 
-    def analyze_expenses(self, income: float, expenses: Dict[str, float]) -> Dict[str, Any]:
+    def analyze_expenses(self, income: float, expenses: Dict[str, float],
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Analyze expenses and provide personalized budgeting advice.
 
         Args:
             income (float): Monthly income
             expenses (Dict[str, float]): Dictionary of monthly expenses
+            timeout (float, optional): Seconds the call may wait for LLM capacity
         """
         total_expenses = sum(expenses.values())
         expense_breakdown = "\n".join([f"{category}: ₹{amount}" for category, amount in expenses.items()])
@@ -90,14 +94,18 @@ class PersonalFinanceAssistant:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            content = chat_completion(
+                self.client,
                 model="llama-3.2-90b-text-preview",
                 messages=[{"role": "system", "content": prompt}],
+                timeout=timeout,
                 temperature=0.1
             )
 
-            return json.loads(response.choices[0].message.content.strip())
+            return json.loads(content)
 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             print(f"Error in expense analysis: {str(e)}")
             return None
@@ -219,18 +227,36 @@ class PersonalFinanceAssistant:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            content = chat_completion(
+                self.client,
                 model="llama-3.2-90b-text-preview",
                 messages=[{"role": "system", "content": prompt}],
                 temperature=0.1
             )
 
-            return json.loads(response.choices[0].message.content.strip())
+            return json.loads(content)
 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             print(f"Error creating savings plan: {str(e)}")
             return None
 
+    @staticmethod
+    def parse_goals(goals: List[str]) -> List[Tuple[str, float]]:
+        """
+        Parse "Description: amount" goals, skipping entries without an amount.
+
+        Args:
+            goals (List[str]): Financial goals
+        """
+        parsed = []
+        for goal in goals:
+            if ":" in goal:
+                goal_desc, amount = goal.split(":")
+                parsed.append((goal_desc, float(amount)))
+        return parsed
+
     def generate_financial_report(self,
                                 income: float,
                                 expenses: Dict[str, float],
@@ -251,13 +277,10 @@ class PersonalFinanceAssistant:
 
             # Create savings plans for goals
             savings_plans = []
-            for goal in goals:
-                if ":" in goal:
-                    goal_desc, amount = goal.split(":")
-                    amount = float(amount)
-                    plan = self.create_savings_plan(income, amount, 12)
-                    if plan:
-                        savings_plans.append({"goal": goal_desc, "plan": plan})
+            for goal_desc, amount in self.parse_goals(goals):
+                plan = self.create_savings_plan(income, amount, 12)
+                if plan:
+                    savings_plans.append({"goal": goal_desc, "plan": plan})
 
             # Get assistance programs
             assistance_programs = self.get_assistance_programs()
@@ -271,10 +294,77 @@ class PersonalFinanceAssistant:
             }
             return report
 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             print(f"Error generating financial report: {str(e)}")
             return {}
 
+    def iter_report_sections(self,
+                             income: float,
+                             expenses: Dict[str, float],
+                             savings: float,
+                             goals: List[Tuple[str, float]],
+                             max_workers: int = 4) -> Iterator[Dict[str, Any]]:
+        """
+        Yield report sections as they finish instead of waiting for the whole report.
+
+        The static assistance programs are yielded first, then the expense
+        analysis, then each goal's savings plan in completion order. A failed
+        section is yielded as an error event without stopping the others.
+
+        Args:
+            income (float): Monthly income
+            expenses (Dict[str, float]): Monthly expenses by category
+            savings (float): Current savings
+            goals (List[Tuple[str, float]]): Goals as returned by parse_goals
+            max_workers (int): LLM calls made in parallel for this report
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            analysis_future = executor.submit(self.analyze_expenses, income, expenses)
+            plan_futures = {
+                executor.submit(self.create_savings_plan, income, amount, 12): goal_desc
+                for goal_desc, amount in goals
+            }
+
+            yield {
+                'section': 'assistance_programs',
+                'data': self.get_assistance_programs()
+            }
+
+            yield self._section_event('financial_analysis', analysis_future)
+
+            for future in as_completed(plan_futures):
+                yield self._section_event('savings_plan', future, goal=plan_futures[future])
+
+            yield {
+                'section': 'done',
+                'analysis_date': datetime.now().strftime('%Y-%m-%d')
+            }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _section_event(section: str, future, **fields) -> Dict[str, Any]:
+        event = {'section': section, **fields}
+        failure = f"Could not generate {section.replace('_', ' ')}"
+        try:
+            data = future.result()
+        except LLMUnavailableError as e:
+            event.update(error=str(e), retry_after=e.retry_after_seconds)
+            return event
+        except Exception as e:
+            print(f"Error generating {section}: {str(e)}")
+            event['error'] = failure
+            return event
+
+        if data is None:
+            event['error'] = failure
+        else:
+            event['data'] = data
+        return event
+
 # Example usage
 if __name__ == "__main__":
     assistant = PersonalFinanceAssistant()
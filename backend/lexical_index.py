@@ -0,0 +1,131 @@
+import re
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'the', 'to', 'under', 'will', 'with'
+])
+
+
+def _fold_plural(token: str) -> str:
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens without stopwords, with simple plurals folded."""
+    return [_fold_plural(token) for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _bigrams(tokens: List[str]) -> List[str]:
+    return [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def document_terms(text: str) -> List[str]:
+    """Terms a document is indexed under: its tokens and adjacent token pairs."""
+    tokens = tokenize(text)
+    return tokens + _bigrams(tokens)
+
+
+def phrase_terms(phrase: str) -> List[str]:
+    """
+    Query terms for a keyword phrase: the token of a one-word phrase, or the
+    adjacent token pairs of a longer one, so "old age" does not match every
+    document mentioning "age".
+    """
+    tokens = tokenize(phrase)
+    return tokens if len(tokens) == 1 else _bigrams(tokens)
+
+
+class BM25Index:
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Okapi BM25 over a sparse document-term matrix. Documents are indexed
+        under their tokens and adjacent token pairs (see document_terms).
+
+        Each stored entry already holds its BM25 weight, so scoring a weighted
+        query against every document is a single sparse matrix-vector product.
+
+        Args:
+            documents (List[str]): Document texts, one per scheme
+            k1 (float): Term frequency saturation
+            b (float): Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.num_docs = len(documents)
+        self.vocabulary: Dict[str, int] = {}
+
+        rows, cols, counts = [], [], []
+        doc_lengths = np.zeros(self.num_docs, dtype=np.float64)
+        for doc_id, text in enumerate(documents):
+            terms = document_terms(text)
+            # Length in tokens; every token after the first also starts a pair
+            doc_lengths[doc_id] = (len(terms) + 1) // 2
+            for term, count in Counter(terms).items():
+                rows.append(doc_id)
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.cols = np.asarray(cols, dtype=np.int32)
+        tf = np.asarray(counts, dtype=np.float64)
+
+        doc_freq = np.bincount(self.cols, minlength=len(self.vocabulary))
+        self.idf = np.log(1.0 + (self.num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        avg_length = doc_lengths.mean() if self.num_docs and doc_lengths.mean() > 0 else 1.0
+        length_norm = k1 * (1.0 - b + b * doc_lengths[self.rows] / avg_length)
+        self.data = self.idf[self.cols] * tf * (k1 + 1.0) / (tf + length_norm)
+
+        # Entries are stored document by document, so each document's terms are contiguous
+        doc_ends = np.cumsum(np.bincount(self.rows, minlength=self.num_docs))
+        self._doc_terms: List[Dict[int, float]] = [
+            dict(zip(terms.tolist(), weights.tolist()))
+            for terms, weights in zip(np.split(self.cols, doc_ends[:-1]), np.split(self.data, doc_ends[:-1]))
+        ] if self.num_docs else []
+
+    def query_vector(self, weighted_terms: Dict[str, float]) -> np.ndarray:
+        """Dense vocabulary-sized query vector; unknown terms are dropped."""
+        query = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for term, weight in weighted_terms.items():
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                query[term_id] = max(query[term_id], weight)
+        return query
+
+    def score(self, weighted_terms: Dict[str, float]) -> np.ndarray:
+        """
+        BM25 score of the query against every document.
+
+        Args:
+            weighted_terms (Dict[str, float]): Query terms and their weights
+        """
+        query = self.query_vector(weighted_terms)
+        return np.bincount(self.rows, weights=self.data * query[self.cols], minlength=self.num_docs)
+
+    def max_score(self, weighted_terms: Dict[str, float]) -> float:
+        """
+        Highest score a single query term can contribute to any document:
+        the term present at saturation, weight * idf * (k1 + 1), for the
+        strongest known term.
+
+        Args:
+            weighted_terms (Dict[str, float]): Query terms and their weights
+        """
+        query = self.query_vector(weighted_terms)
+        return float((query * self.idf).max() * (self.k1 + 1.0)) if len(query) else 0.0
+
+    def matched_terms(self, doc_id: int, terms: List[str], min_score: float = 0.0) -> List[str]:
+        """
+        Terms from terms that occur in the document and contribute more than
+        min_score to its score at query weight 1.
+        """
+        doc_terms = self._doc_terms[doc_id]
+        return [term for term in terms if doc_terms.get(self.vocabulary.get(term, -1), 0.0) > min_score]
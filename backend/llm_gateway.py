@@ -0,0 +1,445 @@
+import bisect
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# Lower value is served first
+PRIORITY_CHAT = 0
+PRIORITY_REPORT = 1
+
+# Per-model Groq limits: requests per minute and tokens per minute
+MODEL_LIMITS = {
+    'llama3-70b-8192': {'rpm': 30, 'tpm': 6000},
+    'llama-3.2-90b-text-preview': {'rpm': 30, 'tpm': 7000},
+}
+DEFAULT_MODEL_LIMITS = {'rpm': 30, 'tpm': 6000}
+
+# Completion size assumed when a request does not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 1024
+
+
+class LLMUnavailableError(Exception):
+    """Raised when an LLM call is shed instead of being sent upstream."""
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, int(math.ceil(self.retry_after)))
+
+
+class LLMRateLimitedError(LLMUnavailableError):
+    """The rate limit for the model cannot admit the call in time."""
+    status_code = 429
+
+
+class LLMProviderRateLimitedError(LLMRateLimitedError):
+    """The provider rejected a call that was sent upstream with a rate limit error."""
+
+
+class LLMOverloadedError(LLMUnavailableError):
+    """The queue is full or the call's deadline passed while queued."""
+    status_code = 503
+
+
+class _InFlightCall:
+    """A single outbound call that concurrent duplicates can wait on."""
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Collapse identical concurrent calls into one in-flight call.
+
+        The first caller for a key runs the function; callers arriving with the
+        same key while it is running wait for it and share its result or error.
+        Nothing is cached once the call finishes.
+        """
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+        self._executed = 0
+        self._collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers sharing key.
+
+        Args:
+            key (Hashable): Identity of the call
+            fn (Callable): Zero-argument function performing the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._collapsed += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for executed and collapsed calls."""
+        with self._lock:
+            return {
+                'executed_calls': self._executed,
+                'collapsed_calls': self._collapsed,
+                'in_flight': len(self._calls)
+            }
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, per_minute: float):
+        """
+        Token bucket refilled continuously at per_minute tokens per minute.
+
+        Args:
+            capacity (float): Maximum tokens held by the bucket
+            per_minute (float): Refill rate
+        """
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount tokens are available, assuming nothing else is taken."""
+        self._refill(now)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= amount
+
+
+class _ModelLimiter:
+    """Request and token buckets for one model."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm, rpm)
+        self.tokens = TokenBucket(tpm, tpm)
+
+    def clamp(self, tokens: int) -> int:
+        return min(tokens, int(self.tokens.capacity))
+
+    def wait_time(self, requests: int, tokens: int, now: float) -> float:
+        return max(self.requests.wait_time(requests, now), self.tokens.wait_time(tokens, now))
+
+    def consume(self, tokens: int, now: float) -> None:
+        self.requests.consume(1, now)
+        self.tokens.consume(tokens, now)
+
+
+class _Ticket:
+    __slots__ = ('priority', 'seq', 'model', 'tokens', 'enqueued', 'evicted')
+
+    def __init__(self, priority: int, seq: int, model: str, tokens: int, enqueued: float):
+        self.priority = priority
+        self.seq = seq
+        self.model = model
+        self.tokens = tokens
+        self.enqueued = enqueued
+        self.evicted = False
+
+    def __lt__(self, other: '_Ticket') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class LLMScheduler:
+    def __init__(self,
+                 model_limits: Optional[Dict[str, Dict[str, int]]] = None,
+                 max_queue: int = 32,
+                 max_concurrency: int = 4,
+                 default_timeout: float = 30.0):
+        """
+        Central admission control for outbound LLM calls.
+
+        Calls wait in a bounded priority queue and are released in priority
+        order once the model's request and token buckets allow it. Calls that
+        cannot be served before their deadline are shed with a retry hint
+        instead of being sent upstream. When the queue is full, a call evicts
+        the lowest-priority waiting call if that one ranks below it.
+
+        Args:
+            model_limits (Dict, optional): Per-model {'rpm': ..., 'tpm': ...} limits
+            max_queue (int): Maximum number of waiting calls
+            max_concurrency (int): Maximum calls in flight at once
+            default_timeout (float): Seconds a call may wait when no timeout is given
+        """
+        self.model_limits = model_limits or MODEL_LIMITS
+        self.max_queue = max_queue
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+
+        self._cond = threading.Condition()
+        self._queue: List[_Ticket] = []
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._seq = itertools.count()
+        self._active = 0
+        self._waits = deque(maxlen=256)
+        self._counters = {
+            'admitted': 0,
+            'shed_queue_full': 0,
+            'shed_rate_limited': 0,
+            'expired_in_queue': 0,
+            'evicted_from_queue': 0
+        }
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limits = self.model_limits.get(model, DEFAULT_MODEL_LIMITS)
+            limiter = _ModelLimiter(limits['rpm'], limits['tpm'])
+            self._limiters[model] = limiter
+        return limiter
+
+    def _is_next(self, ticket: _Ticket) -> bool:
+        for queued in self._queue:
+            if queued.model == ticket.model:
+                return queued is ticket
+        return False
+
+    def _higher_ticket_ready(self, ticket: _Ticket, now: float) -> bool:
+        """
+        Whether a higher-ranked ticket for another model could take a slot now.
+
+        Buckets are per model but concurrency slots are shared, so slots are
+        handed out in global priority order among the tickets whose bucket
+        allows them to run.
+        """
+        for queued in self._queue:
+            if not queued < ticket:
+                return False
+            if (queued.model != ticket.model and self._is_next(queued)
+                    and self._limiter(queued.model).wait_time(1, queued.tokens, now) <= 0):
+                return True
+        return False
+
+    def _admit(self, model: str, tokens: int, priority: int, timeout: float) -> None:
+        now = time.monotonic()
+        deadline = now + timeout
+
+        with self._cond:
+            limiter = self._limiter(model)
+            tokens = limiter.clamp(tokens)
+
+            if len(self._queue) >= self.max_queue:
+                # A full queue makes room by dropping its lowest-priority ticket, never a chat call for a report
+                lowest = self._queue[-1]
+                if lowest.priority <= priority:
+                    self._counters['shed_queue_full'] += 1
+                    raise LLMOverloadedError("LLM request queue is full, please retry shortly",
+                                             retry_after=self._queue_drain_estimate(now))
+                self._queue.pop()
+                lowest.evicted = True
+                self._cond.notify_all()
+
+            ticket = _Ticket(priority, next(self._seq), model, tokens, now)
+            ahead = [t for t in self._queue if t.model == model and t < ticket]
+            estimated_wait = limiter.wait_time(len(ahead) + 1, sum(t.tokens for t in ahead) + tokens, now)
+            if estimated_wait > timeout:
+                self._counters['shed_rate_limited'] += 1
+                raise LLMRateLimitedError("LLM rate limit reached, please retry later",
+                                          retry_after=estimated_wait)
+
+            bisect.insort(self._queue, ticket)
+            try:
+                while True:
+                    if ticket.evicted:
+                        self._counters['evicted_from_queue'] += 1
+                        raise LLMOverloadedError("LLM request queue is full, please retry shortly",
+                                                 retry_after=self._queue_drain_estimate(time.monotonic()))
+
+                    now = time.monotonic()
+                    # Seconds until the bucket allows this ticket, when the bucket is what it waits on;
+                    # waits for a slot or a higher-ranked ticket end with a notify instead
+                    wait = None
+                    if self._is_next(ticket):
+                        wait = limiter.wait_time(1, tokens, now)
+                        if wait <= 0:
+                            wait = None
+                        if (wait is None and self._active < self.max_concurrency
+                                and not self._higher_ticket_ready(ticket, now)):
+                            limiter.consume(tokens, now)
+                            self._queue.remove(ticket)
+                            self._active += 1
+                            self._counters['admitted'] += 1
+                            self._waits.append(now - ticket.enqueued)
+                            # The model's next ticket is now at the head and must start its own timed wait
+                            self._cond.notify_all()
+                            return
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._counters['expired_in_queue'] += 1
+                        raise LLMOverloadedError("Timed out waiting for LLM capacity, please retry shortly",
+                                                 retry_after=wait if wait else self._queue_drain_estimate(now))
+                    self._cond.wait(remaining if wait is None else min(wait, remaining))
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                self._cond.notify_all()
+                raise
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _queue_drain_estimate(self, now: float) -> float:
+        """Rough seconds until the current queue has been admitted."""
+        estimate = 0.0
+        for model in {t.model for t in self._queue}:
+            queued = [t for t in self._queue if t.model == model]
+            estimate = max(estimate, self._limiter(model).wait_time(len(queued), sum(t.tokens for t in queued), now))
+        return estimate
+
+    def record_usage(self, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the provider reports real usage."""
+        with self._cond:
+            limiter = self._limiter(model)
+            limiter.tokens.tokens -= actual_tokens - limiter.clamp(estimated_tokens)
+            self._cond.notify_all()
+
+    def run(self,
+            model: str,
+            fn: Callable[[], Any],
+            tokens: int,
+            priority: int = PRIORITY_REPORT,
+            timeout: Optional[float] = None) -> Any:
+        """
+        Wait for capacity for model and then run fn.
+
+        Args:
+            model (str): Model the call is sent to
+            fn (Callable): Zero-argument function performing the call
+            tokens (int): Estimated prompt plus completion tokens
+            priority (int): PRIORITY_CHAT or PRIORITY_REPORT
+            timeout (float, optional): Seconds the call may wait before being shed
+        """
+        self._admit(model, tokens, priority, self.default_timeout if timeout is None else timeout)
+        try:
+            return fn()
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight calls, shed counters and recent wait times."""
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                'queue_depth': len(self._queue),
+                'queue_depth_by_priority': {
+                    'chat': sum(1 for t in self._queue if t.priority == PRIORITY_CHAT),
+                    'report': sum(1 for t in self._queue if t.priority == PRIORITY_REPORT)
+                },
+                'in_flight': self._active,
+                **self._counters,
+                'avg_wait_ms': round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                'p95_wait_ms': round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+                'max_wait_ms': round(1000 * waits[-1], 1) if waits else 0.0
+            }
+
+
+coalescer = SingleFlight()
+scheduler = LLMScheduler()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, assuming about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def _estimate_tokens(messages: List[Dict[str, str]], params: Dict[str, Any]) -> int:
+    """Prompt tokens plus the completion allowance."""
+    prompt_tokens = sum(estimate_tokens(m.get('content', '')) for m in messages)
+    return prompt_tokens + params.get('max_tokens', DEFAULT_COMPLETION_TOKENS)
+
+
+def _retry_after_header(error, default: float = 2.0) -> float:
+    try:
+        return float(error.response.headers.get('retry-after', default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _request_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    return json.dumps([model, messages, params], sort_keys=True, ensure_ascii=False)
+
+
+def chat_completion(client,
+                    model: str,
+                    messages: List[Dict[str, str]],
+                    priority: int = PRIORITY_REPORT,
+                    timeout: Optional[float] = None,
+                    **params) -> str:
+    """
+    Send a chat completion request through the scheduler, sharing the
+    response with identical concurrent requests.
+
+    Args:
+        client (Groq): Groq client used if this call is the one that runs
+        model (str): Model name
+        messages (List[Dict[str, str]]): Chat messages
+        priority (int): PRIORITY_CHAT or PRIORITY_REPORT
+        timeout (float, optional): Seconds the call may wait for capacity
+        **params: Sampling parameters such as temperature and max_tokens
+
+    Raises:
+        LLMUnavailableError: If the call was shed or the provider rate limited it
+    """
+    estimated_tokens = _estimate_tokens(messages, params)
+
+    def send() -> str:
+        import groq
+
+        try:
+            response = client.chat.completions.create(model=model, messages=messages, **params)
+        except groq.RateLimitError as e:
+            raise LLMProviderRateLimitedError("LLM provider rate limit reached, please retry later",
+                                              retry_after=_retry_after_header(e)) from e
+        if response.usage is not None:
+            scheduler.record_usage(model, estimated_tokens, response.usage.total_tokens)
+        return response.choices[0].message.content.strip()
+
+    def call() -> str:
+        return scheduler.run(model, send, estimated_tokens, priority=priority, timeout=timeout)
+
+    return coalescer.do(_request_key(model, messages, params), call)
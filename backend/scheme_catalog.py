@@ -0,0 +1,231 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+CATALOG_FORMAT_VERSION = 1
+
+SCHEMES_FILE = 'schemes.json'
+EMBEDDINGS_FILE = 'embeddings.npy'
+KEYWORD_INDEX_FILE = 'keyword_index.json'
+PROFILE_TEXTS_FILE = 'profile_texts.json'
+PROFILE_EMBEDDINGS_FILE = 'profile_embeddings.npy'
+MANIFEST_FILE = 'manifest.json'
+
+# Every age the scheme form accepts
+DEFAULT_PROFILE_AGES = range(0, 121)
+
+# Form values with no keyword mapping of their own that still need a profile embedding
+EXTRA_PROFILE_VALUES = {
+    'gender': ['other']
+}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _profile_texts(matcher, ages: Iterable[int]) -> List[str]:
+    """Profile texts for every combination of the profile values the scheme form sends."""
+    values = {
+        criterion: list(matcher.keyword_mappings[criterion]) + EXTRA_PROFILE_VALUES.get(criterion, [])
+        for criterion in ('gender', 'occupation', 'category', 'location')
+    }
+    combinations = itertools.product(
+        values['gender'], ages, values['occupation'], values['category'], values['location']
+    )
+    return [
+        matcher.profile_text(matcher.normalize_profile({
+            'gender': gender,
+            'age': age,
+            'occupation': occupation,
+            'category': category,
+            'location': location
+        }))
+        for gender, age, occupation, category, location in combinations
+    ]
+
+
+def build_catalog(pdf_path: str, out_dir: str, profile_ages: Iterable[int] = DEFAULT_PROFILE_AGES) -> Dict[str, Any]:
+    """
+    Parse the scheme PDF and write a self-contained catalog for serving.
+
+    Args:
+        pdf_path (str): Path to the government schemes PDF
+        out_dir (str): Directory the catalog is written to (replaced if it exists)
+        profile_ages (Iterable[int]): Ages for which profile embeddings are precomputed
+    """
+    from scheme_matcher import EMBEDDING_DIM, MODEL_NAME, ImprovedSchemeMatcher
+
+    matcher = ImprovedSchemeMatcher()
+    matcher.load_schemes(pdf_path)
+
+    corpus = matcher.schemes
+    records = [{
+        'code': scheme.code,
+        'name': scheme.name,
+        'ministry': scheme.ministry,
+        'objective': scheme.objective,
+        'beneficiary': scheme.beneficiary,
+        'features': scheme.features
+    } for scheme in corpus]
+    embeddings = corpus.embeddings
+
+    keywords = sorted({
+        keyword
+        for values in matcher.keyword_mappings.values()
+        for value_keywords in values.values()
+        for keyword in value_keywords
+    })
+    keyword_index = {
+        keyword: np.flatnonzero(corpus.keyword_mask(keyword)).tolist()
+        for keyword in keywords
+    }
+
+    profile_texts = _profile_texts(matcher, profile_ages)
+    if profile_texts:
+        profile_embeddings = np.asarray(
+            matcher.encoder.encode(profile_texts, batch_size=256), dtype=np.float32
+        )
+    else:
+        profile_embeddings = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+
+    out_path = Path(out_dir)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(prefix='.catalog-', dir=out_path.parent))
+    try:
+        with open(tmp_path / SCHEMES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        np.save(tmp_path / EMBEDDINGS_FILE, embeddings)
+        with open(tmp_path / KEYWORD_INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(keyword_index, f)
+        with open(tmp_path / PROFILE_TEXTS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(profile_texts, f, ensure_ascii=False)
+        np.save(tmp_path / PROFILE_EMBEDDINGS_FILE, profile_embeddings)
+
+        manifest = {
+            'format_version': CATALOG_FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'model_name': MODEL_NAME,
+            'embedding_dim': EMBEDDING_DIM,
+            'scheme_count': len(records),
+            'keyword_count': len(keyword_index),
+            'profile_count': len(profile_texts),
+            'source_pdf': os.path.basename(pdf_path),
+            'source_sha256': _sha256(Path(pdf_path)),
+            'files': {
+                name: _sha256(tmp_path / name)
+                for name in (SCHEMES_FILE, EMBEDDINGS_FILE, KEYWORD_INDEX_FILE,
+                             PROFILE_TEXTS_FILE, PROFILE_EMBEDDINGS_FILE)
+            }
+        }
+        with open(tmp_path / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        if out_path.exists():
+            shutil.rmtree(out_path)
+        tmp_path.rename(out_path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    return manifest
+
+
+def load_catalog(catalog_dir: str, source_pdf: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load a catalog written by build_catalog using only NumPy and the standard library.
+
+    Every file is checked against the checksum in the manifest, and when
+    source_pdf is given the catalog must have been built from that PDF.
+
+    Args:
+        catalog_dir (str): Directory containing the catalog artifact
+        source_pdf (str, optional): Scheme PDF the catalog is expected to match
+
+    Raises:
+        ValueError: If the catalog is missing files, corrupt, from another format version or stale
+    """
+    try:
+        return _read_catalog(Path(catalog_dir), source_pdf)
+    except (OSError, KeyError) as e:
+        raise ValueError(f"Catalog at {catalog_dir} is incomplete or unreadable: {str(e)}") from e
+
+
+def _read_catalog(path: Path, source_pdf: Optional[str]) -> Dict[str, Any]:
+    with open(path / MANIFEST_FILE, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != CATALOG_FORMAT_VERSION:
+        raise ValueError(f"Unsupported catalog format version: {manifest.get('format_version')}")
+
+    for name, checksum in manifest['files'].items():
+        if _sha256(path / name) != checksum:
+            raise ValueError(f"Catalog file {name} does not match its manifest checksum")
+    if source_pdf is not None and _sha256(Path(source_pdf)) != manifest['source_sha256']:
+        raise ValueError(f"Catalog is stale: {source_pdf} changed since the catalog was built")
+
+    with open(path / SCHEMES_FILE, encoding='utf-8') as f:
+        schemes = json.load(f)
+    embeddings = np.load(path / EMBEDDINGS_FILE)
+    if embeddings.shape != (manifest['scheme_count'], manifest['embedding_dim']):
+        raise ValueError(f"Catalog embeddings have shape {embeddings.shape}, expected "
+                         f"({manifest['scheme_count']}, {manifest['embedding_dim']})")
+
+    with open(path / KEYWORD_INDEX_FILE, encoding='utf-8') as f:
+        keyword_index = json.load(f)
+
+    with open(path / PROFILE_TEXTS_FILE, encoding='utf-8') as f:
+        profile_texts = json.load(f)
+    profile_matrix = np.load(path / PROFILE_EMBEDDINGS_FILE)
+
+    return {
+        'manifest': manifest,
+        'schemes': schemes,
+        'embeddings': embeddings,
+        'keyword_index': keyword_index,
+        'profile_embeddings': dict(zip(profile_texts, profile_matrix))
+    }
+
+
+def _parse_ages(value: str) -> List[int]:
+    """Parse an age range such as "18-60", a list such as "18,25,40", or "none"."""
+    if value.lower() == 'none':
+        return []
+    if '-' in value:
+        start, end = value.split('-')
+        return list(range(int(start), int(end) + 1))
+    return [int(age) for age in value.split(',')]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline scheme catalog tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build-catalog', help="Parse the scheme PDF into a catalog artifact")
+    build.add_argument('--pdf', default='./Government_Schemes-English.pdf', help="Scheme PDF to parse")
+    build.add_argument('--out', default='./scheme_catalog', help="Directory to write the catalog to")
+    build.add_argument('--profile-ages', default='0-120', type=_parse_ages,
+                       help='Ages to precompute profile embeddings for, e.g. "0-120", "18,30" or "none"')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build-catalog':
+        manifest = build_catalog(args.pdf, args.out, args.profile_ages)
+        print(f"Wrote catalog with {manifest['scheme_count']} schemes and "
+              f"{manifest['profile_count']} profile embeddings to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,257 @@
 import re
 import json
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Optional, Tuple
 import numpy as np
 from pathlib import Path
-import pandas as pd
-import pypdf
 from functools import lru_cache
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import warnings
-from dataclasses import dataclass
 from collections import defaultdict
+from lexical_index import BM25Index, phrase_terms
 warnings.filterwarnings('ignore')
 
-@dataclass
+MODEL_NAME = 'paraphrase-MiniLM-L3-v2'
+EMBEDDING_DIM = 384  # Embedding size for the model
+
+SECTION_HEADERS = {
+    'objective': ['objective', 'aim', 'purpose', 'goals'],
+    'beneficiary': ['intended beneficiary', 'beneficiaries', 'eligible', 'eligibility', 'target group'],
+    'features': ['salient features', 'key features', 'benefits', 'assistance provided']
+}
+
+# Share of a criterion's BM25 upper bound a term must contribute to be listed as a reason
+MIN_REASON_SHARE = 0.25
+
+# Form values that say nothing about the person and must not become query terms
+PLACEHOLDER_PROFILE_VALUES = frozenset(['other', 'others', 'none', 'na', 'not applicable'])
+
+# Profile values as sent by the scheme form, mapped to their keyword_mappings key
+PROFILE_VALUE_ALIASES = {
+    'location': {'semi-urban': 'semi_urban', 'semi urban': 'semi_urban'}
+}
+
+_SCHEME_HEADER_PATTERN = re.compile(r'([A-Z]\.\d+\.)\s*([^\n]+)')
+_TRAILING_NUMBER_PATTERN = re.compile(r'\d+$')
+
+# Any header anywhere in a line, used to skip the common non-header line quickly
+_ANY_SECTION_HEADER_PATTERN = re.compile('|'.join(
+    re.escape(header) for headers in SECTION_HEADERS.values() for header in headers
+))
+# Zero-width lookahead so overlapping headers of different sections are all reported
+_SECTION_HEADER_PATTERN = re.compile('(?=' + '|'.join(
+    f"(?P<{section}>{'|'.join(re.escape(header) for header in headers)})"
+    for section, headers in SECTION_HEADERS.items()
+) + ')')
+
+_DISALLOWED_CHARS_PATTERN = re.compile(r'[^\w\s.,;()-]+')
+_RUPEE_PATTERN = re.compile(r'(?i)rs\.?\s*')
+_NUMBER_RANGE_PATTERN = re.compile(r'(\d+)\s*-\s*(\d+)')
+
 class Scheme:
-    """Data class for storing scheme information"""
-    code: str
-    name: str
-    ministry: str
-    objective: str
-    beneficiary: str
-    features: str
-    embedding: Optional[np.ndarray] = None
+    """Lightweight view of one scheme stored in a SchemeCorpus"""
+    __slots__ = ('_corpus', '_index')
+
+    def __init__(self, corpus: 'SchemeCorpus', index: int):
+        self._corpus = corpus
+        self._index = index
+
+    @property
+    def code(self) -> str:
+        return self._corpus.codes[self._index]
+
+    @property
+    def name(self) -> str:
+        return self._corpus.names[self._index]
+
+    @property
+    def ministry(self) -> str:
+        return self._corpus.ministries[self._corpus.ministry_ids[self._index]]
+
+    @property
+    def objective(self) -> str:
+        return self._corpus.text_field(self._index, 2)
+
+    @property
+    def beneficiary(self) -> str:
+        return self._corpus.text_field(self._index, 0)
+
+    @property
+    def features(self) -> str:
+        return self._corpus.text_field(self._index, 1)
+
+    @property
+    def search_text(self) -> str:
+        return self._corpus.search_texts[self._index]
+
+    @property
+    def embedding(self) -> np.ndarray:
+        return self._corpus.embeddings[self._index]
+
+    def __repr__(self) -> str:
+        return f"Scheme(code={self.code!r}, name={self.name!r})"
+
+class SchemeCorpus:
+    def __init__(self, embedding_dim: int = EMBEDDING_DIM):
+        """
+        Column-wise storage for the scheme corpus.
+
+        Ministries are interned to integer ids and all embeddings share one
+        contiguous float32 matrix. The beneficiary, features and objective
+        text of a scheme is stored as one "beneficiary features objective"
+        string with field offsets; when it is already lowercase (as parsed
+        scheme text is) the same string doubles as the keyword search text.
+        Indexing or iterating yields Scheme views over a row.
+
+        Args:
+            embedding_dim (int): Embedding size
+        """
+        self.codes: List[str] = []
+        self.names: List[str] = []
+        self.ministries: List[str] = []
+        # Lowercased "beneficiary features objective" text used for keyword matching
+        self.search_texts: List[str] = []
+
+        self._texts: List[str] = []
+        self._field_ends = np.zeros((0, 2), dtype=np.int32)
+        self._ministry_lookup: Dict[str, int] = {}
+        self._ministry_ids = np.zeros(0, dtype=np.int32)
+        self._embeddings = np.zeros((0, embedding_dim), dtype=np.float32)
+        self._size = 0
+        self._norms: Optional[np.ndarray] = None
+        self._keyword_masks: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, str]], embeddings: np.ndarray) -> 'SchemeCorpus':
+        """
+        Build a corpus from scheme records and their embedding matrix.
+
+        Args:
+            records (List[Dict[str, str]]): Scheme fields, one dict per scheme
+            embeddings (np.ndarray): Embedding matrix with one row per record
+        """
+        corpus = cls(embeddings.shape[1])
+        corpus._reserve(len(records))
+        for record, embedding in zip(records, embeddings):
+            corpus.append(record['code'], record['name'], record['ministry'], record['objective'],
+                          record['beneficiary'], record['features'], embedding)
+        return corpus
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Scheme:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("scheme index out of range")
+        return Scheme(self, index)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield Scheme(self, index)
+
+    @property
+    def ministry_ids(self) -> np.ndarray:
+        return self._ministry_ids[:self._size]
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._embeddings[:self._size]
+
+    def text_field(self, index: int, field: int) -> str:
+        """Beneficiary (0), features (1) or objective (2) text of a scheme."""
+        text = self._texts[index]
+        beneficiary_end, features_end = self._field_ends[index]
+        if field == 0:
+            return text[:beneficiary_end]
+        if field == 1:
+            return text[beneficiary_end + 1:features_end]
+        return text[features_end + 1:]
+
+    def _intern_ministry(self, ministry: str) -> int:
+        ministry_id = self._ministry_lookup.get(ministry)
+        if ministry_id is None:
+            ministry_id = len(self.ministries)
+            self._ministry_lookup[ministry] = ministry_id
+            self.ministries.append(ministry)
+        return ministry_id
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity == len(self._ministry_ids):
+            return
+        self._ministry_ids = np.resize(self._ministry_ids, capacity)
+        self._field_ends = np.resize(self._field_ends, (capacity, 2))
+        embeddings = np.zeros((capacity, self._embeddings.shape[1]), dtype=np.float32)
+        embeddings[:self._size] = self._embeddings[:self._size]
+        self._embeddings = embeddings
+
+    def compact(self) -> None:
+        """Release spare capacity left by append."""
+        self._reserve(self._size)
+
+    def append(self, code: str, name: str, ministry: str, objective: str,
+               beneficiary: str, features: str, embedding: np.ndarray) -> Scheme:
+        """Add a scheme, growing the id and embedding arrays geometrically."""
+        if self._size == len(self._ministry_ids):
+            self._reserve(max(16, 2 * self._size))
+
+        index = self._size
+        text = f"{beneficiary} {features} {objective}"
+        search_text = text.lower()
+        self.codes.append(code)
+        self.names.append(name)
+        self._texts.append(text)
+        self.search_texts.append(text if search_text == text else search_text)
+        self._field_ends[index] = (len(beneficiary), len(beneficiary) + 1 + len(features))
+        self._ministry_ids[index] = self._intern_ministry(ministry)
+        self._embeddings[index] = embedding
+        self._size += 1
+
+        self._norms = None
+        self._keyword_masks = {}
+        return Scheme(self, index)
+
+    def keyword_mask(self, keyword: str) -> np.ndarray:
+        """Boolean mask of schemes whose search text contains keyword."""
+        mask = self._keyword_masks.get(keyword)
+        if mask is None:
+            mask = np.fromiter((keyword in text for text in self.search_texts), dtype=bool, count=self._size)
+            self._keyword_masks[keyword] = mask
+        return mask
+
+    def seed_keyword_masks(self, keyword_hits: Dict[str, Iterable[int]]) -> None:
+        """Reuse precomputed keyword hits (scheme indices per keyword)."""
+        for keyword, hits in keyword_hits.items():
+            mask = np.zeros(self._size, dtype=bool)
+            mask[list(hits)] = True
+            self._keyword_masks[keyword] = mask
+
+    def cosine_similarities(self, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of vector with every scheme embedding."""
+        if self._norms is None:
+            self._norms = np.linalg.norm(self.embeddings, axis=1)
+        norms = self._norms * np.linalg.norm(vector)
+        similarities = self.embeddings @ np.asarray(vector, dtype=np.float32)
+        return np.divide(similarities, norms, out=np.zeros(self._size, dtype=np.float64), where=norms > 0)
 
 class ImprovedSchemeMatcher:
     def __init__(self, cache_dir: Optional[str] = None):
-        self.encoder = SentenceTransformer('paraphrase-MiniLM-L3-v2')
-        self.schemes: List[Scheme] = []
+        self._encoder = None
+        self.schemes = SchemeCorpus()
         self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        # Set when serving from a prebuilt catalog (see scheme_catalog.py)
+        self.profile_embeddings: Optional[Dict[str, np.ndarray]] = None
+
+        # Built from the scheme texts once schemes are loaded
+        self.lexical_index: Optional[BM25Index] = None
+
+        self.criterion_weights = {
+            'gender': 0.3,
+            'age': 0.25,
+            'occupation': 0.25,
+            'category': 0.2,
+            'location': 0.2
+        }
         
         self.keyword_mappings = {
             'gender': {
@@ -63,14 +286,90 @@ class ImprovedSchemeMatcher:
             }
         }
 
+    @property
+    def encoder(self):
+        """Sentence encoder, imported and loaded on first use."""
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = SentenceTransformer(MODEL_NAME)
+        return self._encoder
+
+    @classmethod
+    def from_catalog(cls, catalog_dir: str, source_pdf: Optional[str] = None) -> 'ImprovedSchemeMatcher':
+        """
+        Create a matcher from a catalog built by `scheme_catalog.py build-catalog`.
+
+        Only NumPy is needed; the encoder is loaded only if a profile's text
+        is not among the catalog's precomputed profile embeddings, and
+        matching falls back to keyword scores if it is not installed.
+
+        Args:
+            catalog_dir (str): Directory containing the catalog artifact
+            source_pdf (str, optional): Scheme PDF the catalog must have been built from
+        """
+        from scheme_catalog import load_catalog
+
+        catalog = load_catalog(catalog_dir, source_pdf)
+        matcher = cls()
+        matcher.schemes = SchemeCorpus.from_records(catalog['schemes'], catalog['embeddings'])
+        matcher.schemes.seed_keyword_masks(catalog['keyword_index'])
+        matcher.profile_embeddings = catalog['profile_embeddings']
+        matcher._build_lexical_index()
+
+        print(f"Successfully loaded {len(matcher.schemes)} schemes from catalog")
+        return matcher
+
+    @staticmethod
+    def profile_text(profile: Dict) -> str:
+        """Text describing a profile, as embedded for semantic matching."""
+        return (
+            f"{profile.get('gender', '')} {profile.get('age', '')} years old "
+            f"{profile.get('occupation', '')} {profile.get('category', '')} person "
+            f"from {profile.get('location', '')} area"
+        )
+
+    @staticmethod
+    def normalize_profile(profile: Dict) -> Dict:
+        """
+        Profile with form aliases mapped to keyword_mappings keys and whole
+        ages written without a fraction, so equivalent profiles share one
+        profile text and therefore one precomputed embedding.
+        """
+        normalized = dict(profile)
+        for criterion, aliases in PROFILE_VALUE_ALIASES.items():
+            value = normalized.get(criterion)
+            if isinstance(value, str):
+                normalized[criterion] = aliases.get(value.strip().lower(), value)
+
+        age = normalized.get('age')
+        if age is not None:
+            try:
+                age = float(age)
+                normalized['age'] = str(int(age)) if age.is_integer() else str(age)
+            except (TypeError, ValueError):
+                normalized['age'] = str(age)
+        return normalized
+
+    def _profile_embedding(self, profile: Dict) -> Optional[np.ndarray]:
+        """
+        Embedding of the profile text, or None when it is not precomputed and
+        sentence_transformers is not installed (catalog serving mode).
+        """
+        try:
+            return self._get_embedding(self.profile_text(profile))
+        except ImportError as e:
+            print(f"Profile not in the scheme catalog and no encoder available ({str(e)}); "
+                  f"using keyword scores only")
+            return None
+
     def _clean_text(self, text: str) -> str:
         """Enhanced text cleaning with special handling for government scheme text."""
         if not text:
             return ""
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'[^\w\s.,;()-]', '', text)
-        text = re.sub(r'(?i)rs\.?\s*', 'rs ', text)
-        text = re.sub(r'(\d+)\s*-\s*(\d+)', r'\1-\2', text)
+        text = " ".join(text.split())
+        text = _DISALLOWED_CHARS_PATTERN.sub('', text)
+        text = _RUPEE_PATTERN.sub('rs ', text)
+        text = _NUMBER_RANGE_PATTERN.sub(r'\1-\2', text)
         return text.strip()
 
     def extract_scheme_details(self, text: str) -> Dict:
@@ -78,51 +377,41 @@ class ImprovedSchemeMatcher:
         if not text:
             return None
 
-        scheme_header_pattern = r'([A-Z]\.\d+\.)\s*([^\n]+)'
-        scheme_header_match = re.match(scheme_header_pattern, text)
+        scheme_header_match = _SCHEME_HEADER_PATTERN.match(text)
 
         if not scheme_header_match:
             return None
 
         scheme_code = scheme_header_match.group(1).strip()
         scheme_name = scheme_header_match.group(2).strip()
+        lines = text.split('\n')
 
         # Skip table of contents entries
-        if re.search(r'\d+$', scheme_name) and len(text.split('\n')) < 3:
+        if _TRAILING_NUMBER_PATTERN.search(scheme_name) and len(lines) < 3:
             return None
 
-        sections = {
-            'objective': ['objective', 'aim', 'purpose', 'goals'],
-            'beneficiary': ['intended beneficiary', 'beneficiaries', 'eligible', 'eligibility', 'target group'],
-            'features': ['salient features', 'key features', 'benefits', 'assistance provided']
-        }
-
-        extracted_sections = {
-            'objective': '',
-            'beneficiary': '',
-            'features': ''
-        }
-
         # Extract sections using multiple possible headers
+        fragments = {section: [] for section in SECTION_HEADERS}
         current_section = None
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
+
+        for line in lines:
             line = line.strip().lower()
-            
-            # Check for section headers
-            for section, headers in sections.items():
-                if any(header.lower() in line for header in headers):
-                    current_section = section
-                    continue
-            
-            # If we're in a section, add content
-            if current_section and line and not any(header.lower() in line for headers in sections.values() for header in headers):
-                extracted_sections[current_section] += line + ' '
+
+            if _ANY_SECTION_HEADER_PATTERN.search(line) is None:
+                # If we're in a section, add content
+                if current_section and line:
+                    fragments[current_section].append(line)
+                continue
+
+            # Header lines switch to the last section (in SECTION_HEADERS order) they mention
+            found = {match.lastgroup for match in _SECTION_HEADER_PATTERN.finditer(line)}
+            current_section = next(section for section in reversed(SECTION_HEADERS) if section in found)
 
         # Clean up extracted sections
-        for section in extracted_sections:
-            extracted_sections[section] = self._clean_text(extracted_sections[section])
+        extracted_sections = {
+            section: self._clean_text(' '.join(section_fragments))
+            for section, section_fragments in fragments.items()
+        }
 
         return {
             'code': scheme_code,
@@ -132,8 +421,24 @@ class ImprovedSchemeMatcher:
             'features': extracted_sections['features']
         }
 
+    def _add_scheme(self, scheme_text: str, ministry: str) -> None:
+        scheme_details = self.extract_scheme_details(scheme_text)
+        if scheme_details:
+            combined_text = f"{scheme_details['beneficiary']} {scheme_details['features']} {scheme_details['objective']}"
+            self.schemes.append(
+                code=scheme_details['code'],
+                name=scheme_details['name'],
+                ministry=ministry,
+                objective=scheme_details['objective'],
+                beneficiary=scheme_details['beneficiary'],
+                features=scheme_details['features'],
+                embedding=self._get_embedding(combined_text)
+            )
+
     def load_schemes(self, pdf_path: str) -> None:
         """Load schemes from PDF with enhanced parsing."""
+        import pypdf
+
         try:
             reader = pypdf.PdfReader(pdf_path)
             current_ministry = ""
@@ -156,20 +461,7 @@ class ImprovedSchemeMatcher:
                     if scheme_match:
                         # Save previous scheme if exists
                         if parsing_scheme and current_scheme_text:
-                            scheme_details = self.extract_scheme_details(current_scheme_text)
-                            if scheme_details:
-                                scheme = Scheme(
-                                    code=scheme_details['code'],
-                                    name=scheme_details['name'],
-                                    ministry=current_ministry,
-                                    objective=scheme_details['objective'],
-                                    beneficiary=scheme_details['beneficiary'],
-                                    features=scheme_details['features'],
-                                    embedding=None
-                                )
-                                combined_text = f"{scheme.beneficiary} {scheme.features} {scheme.objective}"
-                                scheme.embedding = self._get_embedding(combined_text)
-                                self.schemes.append(scheme)
+                            self._add_scheme(current_scheme_text, current_ministry)
 
                         # Start new scheme
                         current_scheme_text = line
@@ -179,21 +471,10 @@ class ImprovedSchemeMatcher:
 
             # Process last scheme
             if parsing_scheme and current_scheme_text:
-                scheme_details = self.extract_scheme_details(current_scheme_text)
-                if scheme_details:
-                    scheme = Scheme(
-                        code=scheme_details['code'],
-                        name=scheme_details['name'],
-                        ministry=current_ministry,
-                        objective=scheme_details['objective'],
-                        beneficiary=scheme_details['beneficiary'],
-                        features=scheme_details['features'],
-                        embedding=None
-                    )
-                    combined_text = f"{scheme.beneficiary} {scheme.features} {scheme.objective}"
-                    scheme.embedding = self._get_embedding(combined_text)
-                    self.schemes.append(scheme)
+                self._add_scheme(current_scheme_text, current_ministry)
 
+            self.schemes.compact()
+            self._build_lexical_index()
             print(f"Successfully loaded {len(self.schemes)} schemes")
 
         except Exception as e:
@@ -204,24 +485,27 @@ class ImprovedSchemeMatcher:
     def _get_embedding(self, text: str) -> np.ndarray:
         """Generate and cache embeddings."""
         if not text:
-            return np.zeros(384)  # Default embedding size for the model
+            return np.zeros(EMBEDDING_DIM)
+        if self.profile_embeddings is not None and text in self.profile_embeddings:
+            return self.profile_embeddings[text]
         return self.encoder.encode(text)
 
+    @staticmethod
+    def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+        norm = np.linalg.norm(a) * np.linalg.norm(b)
+        if norm == 0:
+            return 0.0
+        return float(np.dot(a, b) / norm)
+
     def _calculate_keyword_score(self, profile: Dict, scheme: Scheme) -> Tuple[float, List[str]]:
         """Calculate keyword-based matching score with detailed reasoning."""
         score = 0.0
         reasons = []
         total_weight = 0.0
 
-        scheme_text = f"{scheme.beneficiary} {scheme.features} {scheme.objective}".lower()
+        scheme_text = scheme.search_text
 
-        weights = {
-            'gender': 0.3,
-            'age': 0.25,
-            'occupation': 0.25,
-            'category': 0.2,
-            'location': 0.2
-        }
+        weights = self.criterion_weights
 
         def check_keywords(category: str, value: str, weight: float) -> float:
             if not value or category not in self.keyword_mappings:
@@ -246,39 +530,196 @@ class ImprovedSchemeMatcher:
 
         return score, reasons
 
+    def _calculate_keyword_scores(self, profile: Dict) -> Tuple[np.ndarray, List[Tuple[str, str, List[str], List[np.ndarray]]]]:
+        """
+        Keyword scores for every scheme at once, equivalent to _calculate_keyword_score.
+
+        Returns the scores and, per criterion with keywords, the keywords and
+        their scheme masks for building relevance reasons.
+        """
+        scores = np.zeros(len(self.schemes), dtype=np.float64)
+        criteria = []
+        total_weight = 0.0
+
+        for criterion, weight in self.criterion_weights.items():
+            if criterion not in profile:
+                continue
+            total_weight += weight
+            value = profile[criterion]
+            if not value or criterion not in self.keyword_mappings:
+                continue
+
+            keywords = self.keyword_mappings[criterion].get(value.lower(), [])
+            if not keywords:
+                continue
+            masks = [self.schemes.keyword_mask(keyword) for keyword in keywords]
+            scores += weight * np.logical_or.reduce(masks)
+            criteria.append((criterion, value, keywords, masks))
+
+        if total_weight > 0:
+            scores /= total_weight
+        return scores, criteria
+
+    @staticmethod
+    def _keyword_reasons(scheme_index: int, criteria: List[Tuple[str, str, List[str], List[np.ndarray]]]) -> List[str]:
+        reasons = []
+        for criterion, value, keywords, masks in criteria:
+            matched_keywords = [keyword for keyword, mask in zip(keywords, masks) if mask[scheme_index]]
+            if matched_keywords:
+                reasons.append(f"Matches {value} {criterion} (keywords: {', '.join(matched_keywords)})")
+        return reasons
+
+    def _build_lexical_index(self) -> None:
+        """Build the BM25 index over scheme beneficiary, features and objective text."""
+        self.lexical_index = BM25Index(self.schemes.search_texts)
+
+    @staticmethod
+    def _age_group(age) -> Optional[str]:
+        try:
+            age = float(age)
+        except (TypeError, ValueError):
+            return None
+        if age < 18:
+            return 'child'
+        if age <= 35:
+            return 'youth'
+        if age <= 60:
+            return 'adult'
+        return 'senior'
+
+    def _expand_profile_terms(self, profile: Dict) -> Dict[str, List[str]]:
+        """
+        Query terms per criterion: the profile value itself plus the keywords
+        mapped to it, so values outside keyword_mappings still contribute.
+        Multi-word phrases are kept as token pairs rather than split into
+        common words, and a raw age is only used through its age group.
+        """
+        expanded = {}
+        for criterion in self.criterion_weights:
+            value = profile.get(criterion)
+            if not value:
+                continue
+            value = str(value).lower()
+            if criterion == 'age':
+                phrases = self.keyword_mappings['age'].get(self._age_group(value), [])
+            else:
+                phrases = [] if value in PLACEHOLDER_PROFILE_VALUES else [value]
+                phrases += self.keyword_mappings.get(criterion, {}).get(value, [])
+
+            terms = []
+            for phrase in phrases:
+                for term in phrase_terms(phrase):
+                    if term not in terms:
+                        terms.append(term)
+            if terms:
+                expanded[criterion] = terms
+        return expanded
+
+    def _calculate_bm25_scores(self, profile: Dict) -> Tuple[np.ndarray, Dict[str, List[str]]]:
+        """
+        Score the profile's expanded terms against every scheme with BM25.
+
+        Each criterion's terms are alternatives for one profile value, so a
+        criterion is scored on its own and scaled by its upper bound, its
+        strongest term matched at saturation, capped at 1. The criterion
+        scores are then weighted like the binary scorer's, so 1 means every
+        criterion fully matched and scores are comparable across profiles.
+
+        Returns the scores and the expanded terms per criterion for building
+        relevance reasons.
+        """
+        expanded = self._expand_profile_terms(profile)
+        scores = np.zeros(len(self.schemes))
+        total_weight = 0.0
+        for criterion, weight in self.criterion_weights.items():
+            if criterion not in profile:
+                continue
+            total_weight += weight
+            if criterion not in expanded:
+                continue
+            query = dict.fromkeys(expanded[criterion], 1.0)
+            upper_bound = self.lexical_index.max_score(query)
+            if upper_bound > 0:
+                scores += weight * np.minimum(self.lexical_index.score(query) / upper_bound, 1.0)
+
+        if total_weight > 0:
+            scores /= total_weight
+        return scores, expanded
+
+    def _bm25_reasons(self, scheme_index: int, profile: Dict, expanded: Dict[str, List[str]]) -> List[str]:
+        """Criteria with terms contributing at least MIN_REASON_SHARE of the criterion's upper bound."""
+        reasons = []
+        for criterion, terms in expanded.items():
+            min_score = MIN_REASON_SHARE * self.lexical_index.max_score(dict.fromkeys(terms, 1.0))
+            matched_terms = self.lexical_index.matched_terms(scheme_index, terms, min_score)
+            if matched_terms:
+                reasons.append(f"Matches {profile[criterion]} {criterion} (terms: {', '.join(matched_terms)})")
+        return reasons
+
     def _calculate_semantic_score(self, profile: Dict, scheme: Scheme) -> float:
         """Calculate semantic similarity score."""
-        profile_text = (
-            f"{profile.get('gender', '')} {profile.get('age', '')} years old "
-            f"{profile.get('occupation', '')} {profile.get('category', '')} person "
-            f"from {profile.get('location', '')} area"
-        )
-        profile_embedding = self._get_embedding(profile_text)
-
-        return float(cosine_similarity([profile_embedding], [scheme.embedding])[0][0])
+        profile_embedding = self._profile_embedding(self.normalize_profile(profile))
+        if profile_embedding is None:
+            return 0.0
+        return self._cosine_similarity(profile_embedding, scheme.embedding)
+
+    def find_matching_schemes(self, profile: Dict, top_k: int = 5, keyword_scorer: str = 'binary') -> List[Dict]:
+        """
+        Find matching schemes using hybrid approach with improved scoring.
+
+        keyword_scorer selects the lexical side of the score: 'binary' checks
+        for any mapped keyword per criterion, 'bm25' ranks schemes by BM25
+        over the profile's expanded terms.
+        """
+        if keyword_scorer not in ('binary', 'bm25'):
+            raise ValueError(f"Unknown keyword scorer: {keyword_scorer}")
+        if not len(self.schemes):
+            return []
+        profile = self.normalize_profile(profile)
+
+        if keyword_scorer == 'bm25':
+            keyword_scores, expanded_terms = self._calculate_bm25_scores(profile)
+        else:
+            keyword_scores, keyword_criteria = self._calculate_keyword_scores(profile)
+
+        profile_embedding = self._profile_embedding(profile)
+        if profile_embedding is None:
+            semantic_scores = np.zeros(len(self.schemes))
+            final_scores = keyword_scores
+        else:
+            semantic_scores = self.schemes.cosine_similarities(profile_embedding)
+            final_scores = (keyword_scores * 0.6) + (semantic_scores * 0.4)
+        candidates = np.flatnonzero(final_scores > 0.2)
+
+        # Only schemes that can reach the top_k after rounding need a result entry
+        if len(candidates) > top_k:
+            kth_score = np.partition(final_scores[candidates], -top_k)[-top_k]
+            candidates = candidates[final_scores[candidates] >= kth_score - 1e-4]
 
-    def find_matching_schemes(self, profile: Dict, top_k: int = 5) -> List[Dict]:
-        """Find matching schemes using hybrid approach with improved scoring."""
         matches = []
-        for scheme in self.schemes:
-            keyword_score, reasons = self._calculate_keyword_score(profile, scheme)
-            semantic_score = self._calculate_semantic_score(profile, scheme)
-
-            final_score = (keyword_score * 0.6) + (semantic_score * 0.4)
-
-            if final_score > 0.2:
-                matches.append({
-                    'scheme_code': scheme.code,
-                    'scheme_name': scheme.name,
-                    'ministry': scheme.ministry,
-                    'objective': scheme.objective,
-                    'beneficiary': scheme.beneficiary,
-                    'features': scheme.features,
-                    'match_score': round(final_score * 100, 2),
-                    'keyword_score': round(keyword_score * 100, 2),
-                    'semantic_score': round(semantic_score * 100, 2),
-                    'relevance_reasons': reasons
-                })
+        for i in candidates.tolist():
+            scheme = self.schemes[i]
+            keyword_score = float(keyword_scores[i])
+            semantic_score = float(semantic_scores[i])
+            final_score = float(final_scores[i])
+
+            if keyword_scorer == 'bm25':
+                reasons = self._bm25_reasons(i, profile, expanded_terms)
+            else:
+                reasons = self._keyword_reasons(i, keyword_criteria)
+
+            matches.append({
+                'scheme_code': scheme.code,
+                'scheme_name': scheme.name,
+                'ministry': scheme.ministry,
+                'objective': scheme.objective,
+                'beneficiary': scheme.beneficiary,
+                'features': scheme.features,
+                'match_score': round(final_score * 100, 2),
+                'keyword_score': round(keyword_score * 100, 2),
+                'semantic_score': round(semantic_score * 100, 2),
+                'relevance_reasons': reasons
+            })
 
         return sorted(matches, key=lambda x: x['match_score'], reverse=True)[:top_k]
 
@@ -60,6 +60,7 @@ const ChatBot = () => {
   const [messages, setMessages] = useState([]);
   const [inputValue, setInputValue] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [sessionId, setSessionId] = useState(null);
   const messagesEndRef = useRef(null);
 
   const scrollToBottom = () => {
@@ -90,7 +91,7 @@ const ChatBot = () => {
             'Content-Type': 'application/json',
             'Accept': 'application/json',
           },
-          body: JSON.stringify({ message: inputValue }),
+          body: JSON.stringify({ message: inputValue, session_id: sessionId }),
         });
 
         if (!response.ok) {
@@ -99,6 +100,7 @@ const ChatBot = () => {
 
         const data = await response.json();
         if (data.status === 'success') {
+          setSessionId(data.session_id);
           setMessages(prev => [...prev, data.response]);
         } else {
           throw new Error(data.message || 'Server error');